@@ -0,0 +1,39 @@
+# damage.py Damage tracking shared by display drivers.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# In damage mode a driver's .show only outputs the region marked as changed by
+# calls to .damage. The driver initialises ._dmode = False and ._dirty = None,
+# includes these functions as methods and clears ._dirty when it is output:
+# from drivers.damage import damage_mode, damage
+# class ILI9341(framebuf.FrameBuffer):
+#     damage_mode = damage_mode
+#     damage = damage
+
+
+# Enable or disable damage tracking.
+def damage_mode(self, v=None):
+    if v is not None:
+        self._dmode = v
+    return self._dmode
+
+
+# Mark a rectangle as changed. Called by nanogui and Writer: application code
+# drawing directly to the framebuf in damage mode must also call it. ._dirty
+# becomes [x0, y0, x1, y1] (x1, y1 exclusive) enclosing all changes.
+def damage(self, x, y, w, h):
+    x0 = max(x, 0)
+    y0 = max(y, 0)
+    x1 = min(x + w, self.width)
+    y1 = min(y + h, self.height)
+    if x1 <= x0 or y1 <= y0:
+        return
+    d = self._dirty
+    if d is None:
+        self._dirty = [x0, y0, x1, y1]
+    else:
+        d[0] = min(d[0], x0)
+        d[1] = min(d[1], y0)
+        d[2] = max(d[2], x1)
+        d[3] = max(d[3], y1)
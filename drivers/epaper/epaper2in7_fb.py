@@ -14,9 +14,41 @@
 
 import framebuf
 import asyncio
+from micropython import const
 from time import sleep_ms, ticks_ms, ticks_us, ticks_diff
 from drivers.boolpalette import BoolPalette
 
+_NBLOCKS = const(8)  # Frame is sent in blocks of 1/8 of the buffer size
+
+
+@micropython.viper
+def _fill(dest: ptr8, length: int):
+    while length:
+        length -= 1
+        dest[length] = 0xFF
+
+
+# Landscape: the display expects each column of vertical bytes (176 pixels)
+# sent from the bottom of the framebuf to the top. Copy transposed data for
+# ncols columns starting at col. args = ncols | tbc << 10 | wid << 20 where tbc
+# is the no. of vertical bytes per column and wid the framebuf width.
+@micropython.viper
+def _tcopy(dest: ptr8, source: ptr8, col: int, args: int):
+    ncols: int = args & 0x3FF
+    tbc: int = (args >> 10) & 0x3FF
+    wid: int = args >> 20
+    n: int = 0
+    while ncols:
+        idx: int = (tbc - 1) * wid + col
+        v: int = tbc
+        while v:
+            dest[n] = source[idx]  # INVERSION HACK ~data
+            n += 1
+            idx -= wid
+            v -= 1
+        col += 1
+        ncols -= 1
+
 
 def asyncio_running():
     try:
@@ -27,6 +59,11 @@ def asyncio_running():
 
 
 class EPD(framebuf.FrameBuffer):
+    # Testing found it necessary to deassert CS after each byte otherwise the
+    # display does not clear down correctly. If False, blocks are sent with a
+    # single SPI write: much faster where the hardware allows.
+    CS_PER_BYTE = True
+
     # A monochrome approach should be used for coding this. The rgb method ensures
     # nothing breaks if users specify colors.
     @staticmethod
@@ -51,6 +88,7 @@ class EPD(framebuf.FrameBuffer):
         self.demo_mode = False  # Special mode enables demos to run
         self._buffer = bytearray(self.height * self.width // 8)
         self._mvb = memoryview(self._buffer)
+        self._obuf = bytearray(len(self._buffer) // _NBLOCKS)  # Output block
         mode = framebuf.MONO_VLSB if landscape else framebuf.MONO_HLSB
         self.palette = BoolPalette(mode)
         super().__init__(self._buffer, self.width, self.height, mode)
@@ -67,6 +105,48 @@ class EPD(framebuf.FrameBuffer):
             self._spi.write(data)
             self._cs(1)
 
+    def _data(self, data, buf1=bytearray(1)):
+        self._dc(1)
+        if EPD.CS_PER_BYTE:
+            send = self._spi.write
+            for b in data:
+                self._cs(0)
+                buf1[0] = b
+                send(buf1)
+                self._cs(1)
+        else:
+            self._cs(0)
+            self._spi.write(data)
+            self._cs(1)
+
+    # Send both frames as a set of blocks. In landscape mode the framebuf is
+    # transposed into the output buffer by a viper kernel. A generator so that
+    # _as_show can yield between blocks.
+    def _send(self):
+        ob = self._obuf
+        mvb = self._mvb
+        dat = self._data
+        cmd = self._command
+        n = len(ob)
+        cmd(b"\x10")  # DATA_START_TRANSMISSION_1
+        _fill(ob, n)
+        for _ in range(_NBLOCKS):
+            dat(ob)
+            yield
+        cmd(b"\x13")  # DATA_START_TRANSMISSION_2 not in datasheet
+        if self._lsc:  # Landscape mode
+            wid = self.width
+            cols = wid // _NBLOCKS
+            args = cols | (self.height // 8) << 10 | wid << 20
+            for col in range(0, wid, cols):
+                _tcopy(ob, mvb, col, args)
+                dat(ob)
+                yield
+        else:
+            for start in range(0, len(mvb), n):
+                dat(mvb[start : start + n])
+                yield
+
     def init(self):
         # Hardware reset
         self._rst(1)
@@ -152,57 +232,13 @@ class EPD(framebuf.FrameBuffer):
     def ready(self):
         return not (self._as_busy or (self._busy() == 0))  # 0 == busy
 
-    async def _as_show(self, buf1=bytearray(1)):
-        mvb = self._mvb
-        send = self._spi.write
+    async def _as_show(self):
         cmd = self._command
-        cmd(b"\x10")  # DATA_START_TRANSMISSION_1
-        self._dc(1)  # For some reason don't need to deassert CS here
-        buf1[0] = 0xFF
         t = ticks_ms()
-        for i in range(len(mvb)):
-            self._cs(0)  # but do when copying the framebuf
-            send(buf1)
-            if not (i & 0x1F) and (ticks_diff(ticks_ms(), t) > 20):
+        for _ in self._send():
+            if ticks_diff(ticks_ms(), t) > 20:
                 await asyncio.sleep_ms(0)
                 t = ticks_ms()
-            self._cs(1)
-        cmd(b"\x13")  # DATA_START_TRANSMISSION_2 not in datasheet
-
-        self._dc(1)
-        # Necessary to deassert CS after each byte otherwise display does not
-        # clear down correctly
-        t = ticks_ms()
-        if self._lsc:  # Landscape mode
-            wid = self.width
-            tbc = self.height // 8  # Vertical bytes per column
-            iidx = wid * (tbc - 1)  # Initial index
-            idx = iidx  # Index into framebuf
-            vbc = 0  # Current vertical byte count
-            hpc = 0  # Horizontal pixel count
-            for i in range(len(mvb)):
-                self._cs(0)
-                buf1[0] = mvb[idx]  # INVERSION HACK ~data
-                send(buf1)
-                self._cs(1)
-                idx -= self.width
-                vbc += 1
-                vbc %= tbc
-                if not vbc:
-                    hpc += 1
-                    idx = iidx + hpc
-                if not (i & 0x1F) and (ticks_diff(ticks_ms(), t) > 20):
-                    await asyncio.sleep_ms(0)
-                    t = ticks_ms()
-        else:
-            for i, b in enumerate(mvb):
-                self._cs(0)
-                buf1[0] = b  # INVERSION HACK ~data
-                send(buf1)
-                self._cs(1)
-                if not (i & 0x1F) and (ticks_diff(ticks_ms(), t) > 20):
-                    await asyncio.sleep_ms(0)
-                    t = ticks_ms()
 
         self.updated.set()  # framebuf has now been copied to the device
         cmd(b"\x12")  # DISPLAY_REFRESH
@@ -213,7 +249,7 @@ class EPD(framebuf.FrameBuffer):
         self.complete.set()
 
     # draw the current frame memory. Blocking time ~180ms
-    def show(self, buf1=bytearray(1)):
+    def show(self):
         if asyncio_running():
             if self._as_busy:
                 raise RuntimeError("Cannot refresh: display is busy.")
@@ -223,45 +259,9 @@ class EPD(framebuf.FrameBuffer):
             asyncio.create_task(self._as_show())
             return
         t = ticks_us()
-        mvb = self._mvb
-        send = self._spi.write
         cmd = self._command
-        cmd(b"\x10")  # DATA_START_TRANSMISSION_1
-        self._dc(1)  # For some reason don't need to deassert CS here
-        buf1[0] = 0xFF
-        for i in range(len(mvb)):
-            self._cs(0)  # but do when copying the framebuf
-            send(buf1)
-            self._cs(1)
-        cmd(b"\x13")  # DATA_START_TRANSMISSION_2 not in datasheet
-
-        self._dc(1)
-        # Necessary to deassert CS after each byte otherwise display does not
-        # clear down correctly
-        if self._lsc:  # Landscape mode
-            wid = self.width
-            tbc = self.height // 8  # Vertical bytes per column
-            iidx = wid * (tbc - 1)  # Initial index
-            idx = iidx  # Index into framebuf
-            vbc = 0  # Current vertical byte count
-            hpc = 0  # Horizontal pixel count
-            for _ in range(len(mvb)):
-                self._cs(0)
-                buf1[0] = mvb[idx]  # INVERSION HACK ~data
-                send(buf1)
-                self._cs(1)
-                idx -= self.width
-                vbc += 1
-                vbc %= tbc
-                if not vbc:
-                    hpc += 1
-                    idx = iidx + hpc
-        else:
-            for b in mvb:
-                self._cs(0)
-                buf1[0] = b  # INVERSION HACK ~data
-                send(buf1)
-                self._cs(1)
+        for _ in self._send():
+            pass
 
         cmd(b"\x12")  # DISPLAY_REFRESH
         te = ticks_us()
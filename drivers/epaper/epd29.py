@@ -33,9 +33,43 @@ def asyncio_running():
 
 
 MAX_BLOCK = const(20)  # Maximum blocking time (ms) for asynchronous show.
+_NBLOCKS = const(8)  # Frame is sent in blocks of 1/8 of the buffer size
+
+
+# Copy inverted data to the output buffer.
+@micropython.viper
+def _icopy(dest: ptr8, source: ptr8, length: int):
+    n: int = 0
+    while n < length:
+        dest[n] = source[n] ^ 0xFF
+        n += 1
+
+
+# Landscape: the display expects each column of vertical bytes (128 pixels)
+# sent from the bottom of the framebuf to the top. Copy inverted, transposed
+# data for ncols columns starting at col. args = ncols | tbc << 10 | wid << 20
+# where tbc is the no. of vertical bytes per column and wid the framebuf width.
+@micropython.viper
+def _tcopy(dest: ptr8, source: ptr8, col: int, args: int):
+    ncols: int = args & 0x3FF
+    tbc: int = (args >> 10) & 0x3FF
+    wid: int = args >> 20
+    n: int = 0
+    while ncols:
+        idx: int = (tbc - 1) * wid + col
+        v: int = tbc
+        while v:
+            dest[n] = source[idx] ^ 0xFF
+            n += 1
+            idx -= wid
+            v -= 1
+        col += 1
+        ncols -= 1
 
 
 class EPD(framebuf.FrameBuffer):
+    CS_PER_BYTE = False  # Set True to deassert CS after every data byte (slow)
+
     # A monochrome approach should be used for coding this. The rgb method ensures
     # nothing breaks if users specify colors.
     @staticmethod
@@ -65,6 +99,7 @@ class EPD(framebuf.FrameBuffer):
 
         self._buffer = bytearray(self.height * self.width // 8)
         self._mvb = memoryview(self._buffer)
+        self._obuf = bytearray(len(self._buffer) // _NBLOCKS)  # Output block
         mode = framebuf.MONO_VLSB if landscape else framebuf.MONO_HLSB
         self.palette = BoolPalette(mode)
         super().__init__(self._buffer, self.width, self.height, mode)
@@ -87,6 +122,35 @@ class EPD(framebuf.FrameBuffer):
             self._spi.write(buf1)
             self._cs(1)
 
+    # Send the framebuf as a set of blocks. Each is inverted and (in landscape
+    # mode) transposed into the output buffer by a viper kernel then sent with
+    # a single SPI write: the Adafruit driver also sends frame data with CS held
+    # low. A generator so that _as_show can yield between blocks.
+    def _send(self):
+        ob = self._obuf
+        mvb = self._mvb
+        dat = self._data if EPD.CS_PER_BYTE else self._block
+        if self._lsc:  # Landscape mode
+            wid = self.width
+            cols = wid // _NBLOCKS
+            args = cols | (self.height // 8) << 10 | wid << 20
+            for col in range(0, wid, cols):
+                _tcopy(ob, mvb, col, args)
+                dat(ob)
+                yield
+        else:
+            n = len(ob)
+            for start in range(0, len(mvb), n):
+                _icopy(ob, mvb[start:], n)
+                dat(ob)
+                yield
+
+    def _block(self, data):
+        self._dc(1)
+        self._cs(0)
+        self._spi.write(data)
+        self._cs(1)
+
     def init(self):
         # Hardware reset
         self._rst(1)
@@ -131,38 +195,14 @@ class EPD(framebuf.FrameBuffer):
     def ready(self):
         return not (self._as_busy or (self._busy() == 0))
 
-    async def _as_show(self, buf1=bytearray(1)):
-        mvb = self._mvb
+    async def _as_show(self):
         cmd = self._command
-        dat = self._data
         cmd(b"\x13")
         t = ticks_ms()
-        if self._lsc:  # Landscape mode
-            wid = self.width
-            tbc = self.height // 8  # Vertical bytes per column
-            iidx = wid * (tbc - 1)  # Initial index
-            idx = iidx  # Index into framebuf
-            vbc = 0  # Current vertical byte count
-            hpc = 0  # Horizontal pixel count
-            for i in range(len(mvb)):
-                buf1[0] = ~mvb[idx]
-                dat(buf1)
-                idx -= wid
-                vbc += 1
-                vbc %= tbc
-                if not vbc:
-                    hpc += 1
-                    idx = iidx + hpc
-                if not (i & 0x0F) and (ticks_diff(ticks_ms(), t) > _MAX_BLOCK):
-                    await asyncio.sleep_ms(0)
-                    t = ticks_ms()
-        else:
-            for i, b in enumerate(mvb):
-                buf1[0] = ~b
-                dat(buf1)
-                if not (i & 0x0F) and (ticks_diff(ticks_ms(), t) > _MAX_BLOCK):
-                    await asyncio.sleep_ms(0)
-                    t = ticks_ms()
+        for _ in self._send():
+            if ticks_diff(ticks_ms(), t) > MAX_BLOCK:
+                await asyncio.sleep_ms(0)
+                t = ticks_ms()
 
         cmd(b"\x11")  # Data stop
         self.updated.set()
@@ -176,7 +216,7 @@ class EPD(framebuf.FrameBuffer):
         self.complete.set()
 
     # draw the current frame memory.
-    def show(self, buf1=bytearray(1)):
+    def show(self):
         if asyncio_running():
             if self._as_busy:
                 raise RuntimeError("Cannot refresh: display is busy.")
@@ -186,38 +226,18 @@ class EPD(framebuf.FrameBuffer):
             asyncio.create_task(self._as_show())
             return
 
-        mvb = self._mvb
         cmd = self._command
-        dat = self._data
         # DATA_START_TRANSMISSION_2 Datasheet P31 indicates this sets
         # busy pin low (True) and that it stays logically True until
         # refresh is complete. In my testing this doesn't happen.
         cmd(b"\x13")
-        if self._lsc:  # Landscape mode
-            wid = self.width
-            tbc = self.height // 8  # Vertical bytes per column
-            iidx = wid * (tbc - 1)  # Initial index
-            idx = iidx  # Index into framebuf
-            vbc = 0  # Current vertical byte count
-            hpc = 0  # Horizontal pixel count
-            for _ in range(len(mvb)):
-                buf1[0] = ~mvb[idx]
-                dat(buf1)
-                idx -= wid
-                vbc += 1
-                vbc %= tbc
-                if not vbc:
-                    hpc += 1
-                    idx = iidx + hpc
-        else:
-            for b in mvb:
-                buf1[0] = ~b
-                dat(buf1)
+        for _ in self._send():
+            pass
 
         cmd(b"\x11")  # Data stop
         sleep_us(20)  # Allow for data coming back: currently ignore this
         cmd(b"\x12")  # DISPLAY_REFRESH
-        # 258ms to get here on Pyboard D
+        # 258ms to get here on Pyboard D with bytewise output
         # Checking with scope, busy goes low now. For 4.9s.
         if not self.demo_mode:
             # Immediate return to avoid blocking the whole application.
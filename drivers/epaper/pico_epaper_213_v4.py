@@ -35,11 +35,13 @@ import asyncio
 from time import sleep_ms, ticks_ms, ticks_diff
 from machine import Pin, SPI
 from drivers.boolpalette import BoolPalette
+from drivers.damage import damage_mode, damage
 
 _RST_PIN = 12  # Pin defaults match wiring of Pico socket
 _DC_PIN = 8
 _CS_PIN = 9
 _BUSY_PIN = 13
+_FULL = (0, 16, 0, 250)  # RAM window (bytes b0..b1-1, rows r0..r1-1) of whole panel
 
 
 def asyncio_running():
@@ -51,6 +53,9 @@ def asyncio_running():
 
 
 class EPD(framebuf.FrameBuffer):
+    damage_mode = damage_mode  # Damage tracking: see drivers/damage.py
+    damage = damage
+
     # A monochrome approach should be used for coding this. The rgb method ensures
     # nothing breaks if users specify colors.
     @staticmethod
@@ -70,6 +75,8 @@ class EPD(framebuf.FrameBuffer):
         self.complete = asyncio.Event()
         # partial refresh
         self._partial = False
+        self._dmode = False  # Damage tracking: partial .show sends only the dirty region
+        self._dirty = None  # Dirty rectangle [x0, y0, x1, y1] (x1, y1 exclusive)
         # Public bound variables required by nanogui. Physical display 250x122
         # Short axis must be an integer no. of bytes (120 vs 122).
         self.width = 250 if landscape else 120
@@ -159,26 +166,102 @@ class EPD(framebuf.FrameBuffer):
     def ready(self):
         return not (self._as_busy or (self._busy() == 1))  # 1 == busy
 
+    # Return the RAM window for a partial refresh as (b0, b1, r0, r1) in physical
+    # bytes and rows. region is (x, y, w, h) or None to use the dirty rectangle
+    # in damage mode, otherwise the whole panel. Returns None if empty.
+    def _window(self, region):
+        d = self._dirty
+        self._dirty = None
+        if region is None:
+            if not self._dmode:
+                return _FULL
+            if d is None:
+                return None
+            x0, y0, x1, y1 = d
+        else:
+            x, y, w, h = region
+            x0 = max(x, 0)
+            y0 = max(y, 0)
+            x1 = min(x + w, self.width)
+            y1 = min(y + h, self.height)
+            if x1 <= x0 or y1 <= y0:
+                return None
+        if self._lsc:  # Logical columns are physical rows. Vertical bytes are sent bottom up.
+            tbc = self.height // 8
+            return (tbc - 1 - ((y1 - 1) >> 3), tbc - (y0 >> 3), x0, x1)
+        return (x0 >> 3, (x1 + 7) >> 3, y0, y1)
+
+    # Restrict RAM writes to a window. init() restores the full window.
+    def _set_window(self, win):
+        b0, b1, r0, r1 = win
+        cmd = self._command
+        cmd(b"\x44", bytes((b0, b1 - 1)))  # Set window
+        cmd(b"\x45", bytes((r0, 0, r1 - 1, 0)))
+        cmd(b"\x4E", bytes((b0,)))  # Set cursor
+        cmd(b"\x4F", bytes((r0, 0)))
+
+    # Send a window of the framebuf. A window never includes the white boundary.
+    # A generator yielding after each row.
+    def _wsend(self, win, buf1=bytearray(1)):
+        b0, b1, r0, r1 = win
+        mvb = self._mvb
+        send = self._spi.write
+        wid = self.width
+        if self._lsc:  # Row r is column r of the framebuf, byte b is vertical byte tbc - 1 - b
+            tbc = self.height // 8
+            for r in range(r0, r1):
+                idx = (tbc - 1 - b0) * wid + r
+                for _ in range(b0, b1):
+                    self._cs(0)
+                    buf1[0] = ~mvb[idx]  # INVERSION HACK ~data
+                    send(buf1)
+                    self._cs(1)
+                    idx -= wid
+                yield
+        else:
+            np = wid // 8  # Bytes per line
+            for r in range(r0, r1):
+                for b in mvb[r * np + b0 : r * np + b1]:
+                    self._cs(0)
+                    buf1[0] = ~b  # INVERSION HACK ~data
+                    send(buf1)
+                    self._cs(1)
+                yield
+
     # micro-gui API; asyncio is running.
     async def do_refresh(self, split=0):
-        assert not self._busy, "Refresh while busy"
+        assert not self._as_busy, "Refresh while busy"
         self.updated.clear()  # Applications can access Event instances
         self.complete.clear()
+        win = _FULL
         if self._partial:
+            if (win := self._window(None)) is None:  # Nothing has changed
+                self.updated.set()
+                self.complete.set()
+                return
             self.init(True)  # Blocks 7ms on Pico 2
-        await self._as_showl()
+        else:
+            self._dirty = None
+        await self._as_show(win)
 
-    async def _as_show(self, buf1=bytearray(1)):
+    async def _as_show(self, win=_FULL, buf1=bytearray(1)):
         mvb = self._mvb
         send = self._spi.write
         cmd = self._command
 
+        if win != _FULL:
+            self._set_window(win)
         cmd(b"\x24")
         self._dc(1)
         # Necessary to deassert CS after each byte otherwise display does not
         # clear down correctly
         t = ticks_ms()
-        if self._lsc:  # Landscape mode
+        if win != _FULL:  # Partial mode: send a region
+            for _ in self._wsend(win):
+                if ticks_diff(ticks_ms(), t) > 20:
+                    await asyncio.sleep_ms(0)
+                    t = ticks_ms()
+        elif self._lsc:  # Landscape mode
             wid = self.width
             tbc = self.height // 8  # Vertical bytes per column
             iidx = wid * (tbc - 1)  # Initial index
@@ -199,6 +282,7 @@ class EPD(framebuf.FrameBuffer):
                     await asyncio.sleep_ms(0)
                     t = ticks_ms()
         else:
+            np = self.width // 8  # Bytes per line
             for i, b in enumerate(mvb):
                 self._cs(0)
                 buf1[0] = ~b  # INVERSION HACK ~data
@@ -222,27 +306,38 @@ class EPD(framebuf.FrameBuffer):
         self.complete.set()
 
     # draw the current frame memory. Blocking time ~180ms
-    def show(self, buf1=bytearray(1)):
+    # In partial mode region=(x, y, w, h) restricts the data sent to that rectangle.
+    def show(self, region=None, buf1=bytearray(1)):
+        win = _FULL
         if self._partial:  # Needs re-initialising including hardware reset
+            if (win := self._window(region)) is None:  # Nothing to send
+                return
             self.init(True)  # otherwise blacks fade with each call.
+        else:
+            self._dirty = None
         if asyncio_running():
             if self._as_busy:
                 raise RuntimeError("Cannot refresh: display is busy.")
             self._as_busy = True
             self.updated.clear()
             self.complete.clear()
-            asyncio.create_task(self._as_show())
+            asyncio.create_task(self._as_show(win))
             return
         mvb = self._mvb
         send = self._spi.write
         cmd = self._command
 
+        if win != _FULL:
+            self._set_window(win)
         cmd(b"\x24")
 
         self._dc(1)
         # Necessary to deassert CS after each byte otherwise display does not
         # clear down correctly
-        if self._lsc:  # Landscape mode
+        if win != _FULL:  # Partial mode: send a region
+            for _ in self._wsend(win):
+                pass
+        elif self._lsc:  # Landscape mode
             wid = self.width
             tbc = self.height // 8  # Vertical bytes per column
             iidx = wid * (tbc - 1)  # Initial index
@@ -49,6 +49,7 @@ import framebuf
 import time
 import asyncio
 from drivers.boolpalette import BoolPalette
+from drivers.damage import damage_mode, damage
 
 
 def asyncio_running():
@@ -81,7 +82,28 @@ def _linv(dest: ptr32, source: ptr32, length: int):
         n -= 1
 
 
+# Invert a rectangle of the framebuf into a contiguous buffer.
+# nb: bytes per row. args: nrows | source stride << 16
+@micropython.viper
+def _rinv(dest: ptr8, source: ptr8, nb: int, args: int):
+    nrows: int = args & 0xFFFF
+    stride: int = args >> 16
+    n: int = 0
+    s: int = 0
+    while nrows:
+        x: int = 0
+        while x < nb:
+            dest[n] = source[s + x] ^ 0xFF
+            n += 1
+            x += 1
+        s += stride
+        nrows -= 1
+
+
 class EPD(framebuf.FrameBuffer):
+    damage_mode = damage_mode  # Damage tracking: see drivers/damage.py
+    damage = damage
+
     # A monochrome approach should be used for coding this. The rgb method ensures
     # nothing breaks if users specify colors.
     @staticmethod
@@ -103,6 +125,8 @@ class EPD(framebuf.FrameBuffer):
         self.maxblock = 25
         # partial refresh
         self._partial = False
+        self._dmode = False  # Damage tracking: partial .show sends only the dirty region
+        self._dirty = None  # Dirty rectangle [x0, y0, x1, y1] (x1, y1 exclusive)
 
         # Public bound variables required by nanogui.
         # Dimensions in pixels as seen by nanogui
@@ -199,6 +223,28 @@ class EPD(framebuf.FrameBuffer):
 
         self.wait_until_ready()
 
+    # Return the RAM window for a partial refresh as (xb0, xb1, y0, y1) where
+    # x is in bytes. region is (x, y, w, h) or None to use the dirty rectangle
+    # in damage mode, otherwise the whole panel. Returns None if empty.
+    def _window(self, region):
+        d = self._dirty
+        self._dirty = None
+        if region is None:
+            if not self._dmode:
+                return (0, _BWIDTH, 0, _EPD_HEIGHT)
+            if d is None:
+                return None
+            x0, y0, x1, y1 = d
+        else:
+            x, y, w, h = region
+            x0 = max(x, 0)
+            y0 = max(y, 0)
+            x1 = min(x + w, _EPD_WIDTH)
+            y1 = min(y + h, _EPD_HEIGHT)
+            if x1 <= x0 or y1 <= y0:
+                return None
+        return (x0 >> 3, (x1 + 7) >> 3, y0, y1)
+
     @micropython.native
     def _bsend(self, start, nbytes):  # Invert b<->w, buffer and send nbytes source bytes
         buf = self._ibuf  # Invert and buffer is done 32 bits at a time, hence >> 2
@@ -233,14 +279,43 @@ class EPD(framebuf.FrameBuffer):
 
         return inner
 
+    # Send a window of the frame buffer. Rows are inverted into the buffer
+    # and sent in as few writes as possible. Same timeout behaviour as above.
+    def _send_window(self, win):
+        xb0, xb1, y0, y1 = win
+        nb = xb1 - xb0  # Bytes per row
+        rows = len(self._ibuf) // nb  # Rows per write
+        asyn = asyncio_running()
+
+        def inner():
+            nonlocal y0
+            ts = time.ticks_ms()
+            while y0 < y1:
+                n = min(rows, y1 - y0)
+                buf = memoryview(self._ibuf)[: n * nb]
+                _rinv(buf, self._mvb[y0 * _BWIDTH + xb0 :], nb, n | _BWIDTH << 16)
+                self._data(buf)
+                y0 += n
+                if asyn and time.ticks_diff(time.ticks_ms(), ts) > self.maxblock:
+                    return y1 - y0  # Caller yields, calls again
+            return 0  # All done
+
+        return inner
+
     # micro-gui API; asyncio is running.
     async def do_refresh(self, split=0):  # split = 5
         assert not self._busy, "Refresh while busy"
         self.updated.clear()  # Applications can access Event instances
         self.complete.clear()
         if self._partial:
-            await self._as_show_partial()
+            win = self._window(None)
+            if win is None:  # Nothing has changed
+                self.updated.set()
+                self.complete.set()
+                return
+            await self._as_show_partial(win)
         else:
+            self._dirty = None
             await self._as_show_full()
 
     def shutdown(self, clear=False):
@@ -252,13 +327,18 @@ class EPD(framebuf.FrameBuffer):
         self.wait_until_ready()
         self.sleep()
 
-    # nanogui API
-    def show(self):
+    # nanogui API. In partial mode region=(x, y, w, h) restricts the data
+    # sent to the display to that rectangle.
+    def show(self, region=None):
         if self._busy:
             raise RuntimeError("Cannot refresh: display is busy.")
         if self._partial:
-            self._show_partial()
+            win = self._window(region)
+            if win is None:  # Nothing to send
+                return
+            self._show_partial(win)
         else:
+            self._dirty = None
             self._show_full()
         if not self.demo_mode:
             # Immediate return to avoid blocking the whole application.
@@ -303,26 +383,26 @@ class EPD(framebuf.FrameBuffer):
         self._busy = False
         self.complete.set()
 
-    def _show_partial(self):
+    def _show_partial(self, win):
         self._busy = True
         if asyncio_running():
             self.updated.clear()
             self.complete.clear()
-            asyncio.create_task(self._as_show_partial())
+            asyncio.create_task(self._as_show_partial(win))
             return
 
-        self._command(b"\x24")
-        sb = self._send_bytes()  # Instantiate closure
+        sb = self._start_partial(win)
         sb()
+        self._end_partial(win)
         self._busy = False
         self._display_on()
 
-    async def _as_show_partial(self):
-        self._command(b"\x24")
-        sb = self._send_bytes()  # Instantiate closure
+    async def _as_show_partial(self, win):
+        sb = self._start_partial(win)
         while sb():
             await asyncio.sleep_ms(0)
 
+        self._end_partial(win)
         self.updated.set()
         self._display_on()
         while self._busy_pin():
@@ -342,22 +422,34 @@ class EPD(framebuf.FrameBuffer):
         self._command(b"\x10")  # deep sleep
         self._data(b"\x01")
 
-    # window and cursor always the same for 4.2"
-    def _set_window(self):
+    # Set the RAM window for a partial refresh and return a closure to send
+    # the data. Only the window is written: the rest of RAM is unchanged.
+    def _start_partial(self, win):
+        full = win == (0, _BWIDTH, 0, _EPD_HEIGHT)
+        if not full:
+            self._set_window(*win)
+            self._set_cursor(win[0], win[2])
+        self._command(b"\x24")
+        return self._send_bytes() if full else self._send_window(win)
+
+    def _end_partial(self, win):  # Restore full window for subsequent refreshes
+        if win != (0, _BWIDTH, 0, _EPD_HEIGHT):
+            self._set_window()
+            self._set_cursor()
+
+    # Window x coordinates are in bytes. Defaults are the whole panel.
+    def _set_window(self, xb0=0, xb1=_BWIDTH, y0=0, y1=_EPD_HEIGHT):
         self._command(b"\x44")
-        self._data(b"\x00")
-        self._data(b"\x31")
+        self._data(int.to_bytes(xb0, 1, "little"))
+        self._data(int.to_bytes(xb1 - 1, 1, "little"))
 
         self._command(b"\x45")
-        self._data(b"\x00")
-        self._data(b"\x00")
-        self._data(b"\x2B")
-        self._data(b"\x01")
+        self._data(int.to_bytes(y0, 2, "little"))
+        self._data(int.to_bytes(y1 - 1, 2, "little"))
 
-    def _set_cursor(self):
+    def _set_cursor(self, xb=0, y=0):
         self._command(b"\x4E")
-        self._data(b"\x00")
+        self._data(int.to_bytes(xb, 1, "little"))
 
         self._command(b"\x4F")
-        self._data(b"\x00")
-        self._data(b"\x00")
+        self._data(int.to_bytes(y, 2, "little"))
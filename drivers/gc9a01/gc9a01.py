@@ -9,6 +9,7 @@ import gc
 import framebuf
 import asyncio
 from drivers.boolpalette import BoolPalette
+from drivers.damage import damage_mode, damage
 
 # Initialisation ported from Russ Hughes' C driver
 # https://github.com/russhughes/gc9a01_mpy/
@@ -45,6 +46,8 @@ def _lcopy(dest: ptr16, source: ptr8, lut: ptr16, length: int, gscale: bool):
 
 
 class GC9A01(framebuf.FrameBuffer):
+    damage_mode = damage_mode  # Damage tracking: see drivers/damage.py
+    damage = damage
 
     lut = bytearray(32)  # Color LUT holds all possible 16-bit colors
 
@@ -68,6 +71,7 @@ class GC9A01(framebuf.FrameBuffer):
         usd=False,
         mirror=False,
         init_spi=False,
+        lines_per_write=1,
     ):
         self._spi = spi
         self._cs = cs
@@ -84,7 +88,12 @@ class GC9A01(framebuf.FrameBuffer):
         buf = bytearray(height * width // 2)  # Frame buffer
         self.mvb = memoryview(buf)
         super().__init__(buf, width, height, self.mode)
-        self._linebuf = bytearray(width * 2)  # Line buffer (16-bit colors)
+        self._lines_per_write = lines_per_write
+        self._linebuf = bytearray(width * 2 * lines_per_write)  # Line buffer (16-bit colors)
+        self._ppong = False  # Ping-pong mode (see .ping_pong)
+        self._dma = None
+        self._dmode = False  # Damage tracking: .show sends only the dirty region
+        self._dirty = None  # Dirty rectangle [x0, y0, x1, y1] (x1, y1 exclusive)
 
         # Hardware reset
         self._rst(0)
@@ -187,21 +196,97 @@ class GC9A01(framebuf.FrameBuffer):
         return self._gscale
 
     def show(self):  # Physical display is in portrait mode
-        clut = GC9A01.lut
-        lb = self._linebuf
-        buf = self.mvb
+        if self._dmode:
+            d = self._dirty
+            if d is not None:
+                self._show_region(d[0], d[1], d[2], d[3])
+            return
+        self._dirty = None
         if self._spi_init:  # A callback was passed
             self._spi_init(self._spi)  # Bus may be shared
         self._wcmd(b"\x2c")  # WRITE_RAM
         self._dc(1)
         self._cs(0)
+        self._wlines(0, self.width // 2 * self.height)
+        self._cs(1)
+
+    # Output a rectangle. Columns are expanded to a byte boundary (2 pixels).
+    # The address window is restored on completion for .show and .do_refresh.
+    def _show_region(self, x0, y0, x1, y1):
+        self._dirty = None
+        clut = GC9A01.lut
         wd = self.width // 2
-        ht = self.height
         cm = self._gscale  # color False, greyscale True
-        for start in range(0, wd * ht, wd):  # For each line
-            _lcopy(lb, buf[start:], clut, wd, cm)  # Copy and map colors
+        buf = self.mvb
+        x0 &= 0xFFFE
+        x1 += x1 & 1
+        nb = (x1 - x0) >> 1  # Source bytes per row
+        lb = memoryview(self._linebuf)[: nb * 4]
+        if self._spi_init:  # A callback was passed
+            self._spi_init(self._spi)  # Bus may be shared
+        self._wcd(b"\x2a", int.to_bytes((x0 << 16) + x1 - 1, 4, "big"))
+        self._wcd(b"\x2b", int.to_bytes((y0 << 16) + y1 - 1, 4, "big"))
+        self._wcmd(b"\x2c")  # WRITE_RAM
+        self._dc(1)
+        self._cs(0)
+        for start in range(y0 * wd + (x0 >> 1), y1 * wd, wd):  # For each line
+            _lcopy(lb, buf[start:], clut, nb, cm)  # Copy and map colors
             self._spi.write(lb)
         self._cs(1)
+        self._wcd(b"\x2a", int.to_bytes(self.width - 1, 4, "big"))
+        self._wcd(b"\x2b", int.to_bytes(self.height - 1, 4, "big"))
+
+    # Enable or disable ping-pong mode. Each batch of lines is converted while DMA
+    # sends the previous one. Without non-blocking SPI the batch size is doubled.
+    def ping_pong(self, v=None):
+        if v is not None and bool(v) != self._ppong:
+            self._ppong = bool(v)
+            if self._dma is not None:
+                self._dma.deinit()
+                self._dma = None
+            self._linebuf = None
+            gc.collect()
+            if v:
+                from drivers.spidma import spidma
+
+                self._dma = spidma(self._spi)
+            self._linebuf = bytearray(self.width * 2 * self._lines_per_write * (2 if v else 1))
+        return self._ppong
+
+    # Output full lines of the frame buffer between byte offsets start and end.
+    # Lines are converted and sent in batches of up to ._lines_per_write.
+    @micropython.native
+    def _wlines(self, start, end):
+        clut = GC9A01.lut
+        wd = self.width // 2
+        lw = self.width * 2  # Output bytes per line
+        lp = lw  # Line pitch in buffer
+        cm = self._gscale  # color False, greyscale True
+        buf = self.mvb
+        lb = memoryview(self._linebuf)
+        dma = self._dma
+        nl = len(lb) // lp  # Lines per buffer
+        if dma is not None:
+            nl >>= 1  # Ping-pong between two buffers
+        nb = 1 if dma is None else 2  # No. of buffers
+        slots = [lb[k * lp :] for k in range(nl * nb)]
+        outs = [lb[k * nl * lp : (k * nl + nl - 1) * lp + lw] for k in range(nb)]
+        i = 0  # Current buffer
+        while start < end:
+            n = min(nl, (end - start) // wd)  # Lines in this batch
+            b = i * nl
+            for k in range(b, b + n):
+                _lcopy(slots[k], buf[start:], clut, wd, cm)  # Copy and map colors
+                start += wd
+            out = outs[i] if n == nl else lb[b * lp : (b + n - 1) * lp + lw]
+            if dma is None:
+                self._spi.write(out)
+            else:  # Convert into one buffer while the other is sent
+                dma.wait()
+                dma.write(out)
+                i ^= 1
+        if dma is not None:
+            dma.wait()
 
     def short_lock(self, v=None):
         if v is not None:
@@ -214,25 +299,20 @@ class GC9A01(framebuf.FrameBuffer):
         if elock is None:
             elock = asyncio.Lock()
         async with self._lock:
+            self._dirty = None  # Whole frame is output
             lines, mod = divmod(self.height, split)  # Lines per segment
             if mod:
                 raise ValueError("Invalid do_refresh arg.")
-            clut = GC9A01.lut
-            lb = self._linebuf
-            buf = self.mvb
             self._wcmd(b"\x2c")  # WRITE_RAM
             self._dc(1)
             wd = self.width // 2
-            cm = self._gscale  # color False, greyscale True
             line = 0
             for _ in range(split):  # For each segment
                 async with elock:
                     if self._spi_init:  # A callback was passed
                         self._spi_init(self._spi)  # Bus may be shared
                     self._cs(0)
-                    for start in range(wd * line, wd * (line + lines), wd):  # For each line
-                        _lcopy(lb, buf[start:], clut, wd, cm)  # Copy and map colors
-                        self._spi.write(lb)
+                    self._wlines(wd * line, wd * (line + lines))
                     line += lines
                     self._cs(1)  # Allow other tasks to use bus
                 await asyncio.sleep_ms(0)
@@ -13,6 +13,7 @@ import gc
 import framebuf
 import asyncio
 from drivers.boolpalette import BoolPalette
+from drivers.damage import damage_mode, damage
 
 
 # Output RGB565 format, 16 bit/pixel:
@@ -41,6 +42,8 @@ def _lcopy(dest: ptr16, source: ptr8, lut: ptr16, length: int, gscale: bool):
 
 
 class ILI9341(framebuf.FrameBuffer):
+    damage_mode = damage_mode  # Damage tracking: see drivers/damage.py
+    damage = damage
 
     lut = bytearray(32)
 
@@ -65,6 +68,7 @@ class ILI9341(framebuf.FrameBuffer):
         init_spi=False,
         mod=None,
         bgr=False,
+        lines_per_write=1,
     ):
         """For more information see
         https://github.com/peterhinch/micropython-nano-gui/blob/master/DRIVERS.md#32-drivers-for-ili9341
@@ -84,7 +88,12 @@ class ILI9341(framebuf.FrameBuffer):
         buf = bytearray(self.height * self.width // 2)
         self.mvb = memoryview(buf)
         super().__init__(buf, self.width, self.height, self.mode)
-        self._linebuf = bytearray(self.width * 2)
+        self._lines_per_write = lines_per_write
+        self._linebuf = bytearray(self.width * 2 * lines_per_write)
+        self._ppong = False  # Ping-pong mode (see .ping_pong)
+        self._dma = None
+        self._dmode = False  # Damage tracking: .show sends only the dirty region
+        self._dirty = None  # Dirty rectangle [x0, y0, x1, y1] (x1, y1 exclusive)
         # Hardware reset
         self._rst(0)
         sleep_ms(50)
@@ -159,12 +168,14 @@ class ILI9341(framebuf.FrameBuffer):
     # mem free on ESP32 43472 bytes (vs 110192)
     @micropython.native
     def show(self):
-        clut = ILI9341.lut
+        if self._dmode:
+            d = self._dirty
+            if d is not None:
+                self._show_region(d[0], d[1], d[2], d[3])
+            return
+        self._dirty = None
         wd = self.width // 2
         ht = self.height
-        cm = self._gscale  # color False, greyscale True
-        lb = self._linebuf
-        buf = self.mvb
         if self._spi_init:  # A callback was passed
             self._spi_init(self._spi)  # Bus may be shared
         # Commands needed to start data write
@@ -173,11 +184,85 @@ class ILI9341(framebuf.FrameBuffer):
         self._wcmd(b"\x2c")  # WRITE_RAM
         self._dc(1)
         self._cs(0)
-        for start in range(0, wd * ht, wd):  # For each line
-            _lcopy(lb, buf[start:], clut, wd, cm)  # Copy and map colors
+        self._wlines(0, wd * ht)
+        self._cs(1)
+
+    # Output a rectangle. Columns are expanded to a byte boundary (2 pixels).
+    @micropython.native
+    def _show_region(self, x0, y0, x1, y1):
+        self._dirty = None
+        clut = ILI9341.lut
+        wd = self.width // 2
+        cm = self._gscale  # color False, greyscale True
+        buf = self.mvb
+        x0 &= 0xFFFE
+        x1 += x1 & 1
+        nb = (x1 - x0) >> 1  # Source bytes per row
+        lb = memoryview(self._linebuf)[: nb * 4]
+        if self._spi_init:  # A callback was passed
+            self._spi_init(self._spi)  # Bus may be shared
+        self._wcd(b"\x2a", int.to_bytes((x0 << 16) + x1 - 1, 4, "big"))  # SET_COLUMN
+        self._wcd(b"\x2b", int.to_bytes((y0 << 16) + y1 - 1, 4, "big"))  # SET_PAGE
+        self._wcmd(b"\x2c")  # WRITE_RAM
+        self._dc(1)
+        self._cs(0)
+        for start in range(y0 * wd + (x0 >> 1), y1 * wd, wd):  # For each line
+            _lcopy(lb, buf[start:], clut, nb, cm)  # Copy and map colors
             self._spi.write(lb)
         self._cs(1)
 
+    # Enable or disable ping-pong mode. Each batch of lines is converted while DMA
+    # sends the previous one. Without non-blocking SPI the batch size is doubled.
+    def ping_pong(self, v=None):
+        if v is not None and bool(v) != self._ppong:
+            self._ppong = bool(v)
+            if self._dma is not None:
+                self._dma.deinit()
+                self._dma = None
+            self._linebuf = None
+            gc.collect()
+            if v:
+                from drivers.spidma import spidma
+
+                self._dma = spidma(self._spi)
+            self._linebuf = bytearray(self.width * 2 * self._lines_per_write * (2 if v else 1))
+        return self._ppong
+
+    # Output full lines of the frame buffer between byte offsets start and end.
+    # Lines are converted and sent in batches of up to ._lines_per_write.
+    @micropython.native
+    def _wlines(self, start, end):
+        clut = ILI9341.lut
+        wd = self.width // 2
+        lw = self.width * 2  # Output bytes per line
+        lp = lw  # Line pitch in buffer
+        cm = self._gscale  # color False, greyscale True
+        buf = self.mvb
+        lb = memoryview(self._linebuf)
+        dma = self._dma
+        nl = len(lb) // lp  # Lines per buffer
+        if dma is not None:
+            nl >>= 1  # Ping-pong between two buffers
+        nb = 1 if dma is None else 2  # No. of buffers
+        slots = [lb[k * lp :] for k in range(nl * nb)]
+        outs = [lb[k * nl * lp : (k * nl + nl - 1) * lp + lw] for k in range(nb)]
+        i = 0  # Current buffer
+        while start < end:
+            n = min(nl, (end - start) // wd)  # Lines in this batch
+            b = i * nl
+            for k in range(b, b + n):
+                _lcopy(slots[k], buf[start:], clut, wd, cm)  # Copy and map colors
+                start += wd
+            out = outs[i] if n == nl else lb[b * lp : (b + n - 1) * lp + lw]
+            if dma is None:
+                self._spi.write(out)
+            else:  # Convert into one buffer while the other is sent
+                dma.wait()
+                dma.write(out)
+                i ^= 1
+        if dma is not None:
+            dma.wait()
+
     def short_lock(self, v=None):
         if v is not None:
             self.lock_mode = v  # If set, user lock is passed to .do_refresh
@@ -192,12 +277,9 @@ class ILI9341(framebuf.FrameBuffer):
             lines, mod = divmod(self.height, split)  # Lines per segment
             if mod:
                 raise ValueError("Invalid do_refresh arg.")
-            clut = ILI9341.lut
             wd = self.width // 2
             ht = self.height
-            cm = self._gscale  # color False, greyscale True
-            lb = self._linebuf
-            buf = self.mvb
+            self._dirty = None  # Whole frame is output
             # Commands needed to start data write
             self._wcd(b"\x2a", int.to_bytes(self.width, 4, "big"))  # SET_COLUMN
             self._wcd(b"\x2b", int.to_bytes(ht, 4, "big"))  # SET_PAGE
@@ -209,9 +291,7 @@ class ILI9341(framebuf.FrameBuffer):
                     if self._spi_init:  # A callback was passed
                         self._spi_init(self._spi)  # Bus may be shared
                     self._cs(0)
-                    for start in range(wd * line, wd * (line + lines), wd):  # For each line
-                        _lcopy(lb, buf[start:], clut, wd, cm)  # Copy and map colors
-                        self._spi.write(lb)
+                    self._wlines(wd * line, wd * (line + lines))
                     line += lines
                     self._cs(1)  # Allow other tasks to use bus
                 await asyncio.sleep_ms(0)
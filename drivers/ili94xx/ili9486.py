@@ -17,6 +17,7 @@ import gc
 import framebuf
 import asyncio
 from drivers.boolpalette import BoolPalette
+from drivers.damage import damage_mode as _damage_mode, damage
 
 # Portrait mode
 @micropython.viper
@@ -64,6 +65,7 @@ def _lscopy(dest: ptr16, source: ptr8, lut: ptr16, ch: int, gscale: bool):
 
 
 class ILI9486(framebuf.FrameBuffer):
+    damage = damage  # Damage tracking: see drivers/damage.py
 
     lut = bytearray(32)
     COLOR_INVERT = 0
@@ -80,7 +82,17 @@ class ILI9486(framebuf.FrameBuffer):
 
     # Transpose width & height for landscape mode
     def __init__(
-        self, spi, cs, dc, rst, height=320, width=480, usd=False, mirror=False, init_spi=False
+        self,
+        spi,
+        cs,
+        dc,
+        rst,
+        height=320,
+        width=480,
+        usd=False,
+        mirror=False,
+        init_spi=False,
+        lines_per_write=1,
     ):
         self._spi = spi
         self._cs = cs
@@ -99,7 +111,13 @@ class ILI9486(framebuf.FrameBuffer):
         buf = bytearray(height * width // 2)
         self.mvb = memoryview(buf)
         super().__init__(buf, width, height, self.mode)  # Logical aspect ratio
-        self._linebuf = bytearray(self._short * 2)
+        self._lines_per_write = lines_per_write  # Physical lines per SPI write
+        self._linebuf = bytearray(self._short * 2 * lines_per_write)
+        self._dmode = False  # Damage tracking: .show sends only the dirty region
+        # A 320x480 display is assumed to be the Waveshare Pi HAT whose shift
+        # register cannot accept commands with multi-byte data values.
+        self._hat = self._short == 320 and self._long == 480
+        self._dirty = None  # Dirty rectangle [x0, y0, x1, y1] (x1, y1 exclusive)
 
         # Hardware reset
         self._rst(0)
@@ -155,31 +173,96 @@ class ILI9486(framebuf.FrameBuffer):
             self._gscale = gs
         return self._gscale
 
+    # Outputting a region needs multi-byte window commands: damage tracking is
+    # not supported on the Waveshare Pi HAT.
+    def damage_mode(self, v=None):
+        if v and self._hat:
+            raise ValueError("Damage mode is not supported by the Waveshare Pi HAT.")
+        return _damage_mode(self, v)
+
     # @micropython.native  # Made almost no difference to timing
     def show(self):  # Physical display is in portrait mode
-        clut = ILI9486.lut
-        lb = self._linebuf
-        buf = self.mvb
-        cm = self._gscale  # color False, greyscale True
+        if self._dmode:
+            d = self._dirty
+            if d is not None:
+                self._show_region(d[0], d[1], d[2], d[3])
+            return
+        self._dirty = None
         if self._spi_init:  # A callback was passed
             self._spi_init(self._spi)  # Bus may be shared
         self._wcmd(b"\x2c")  # WRITE_RAM
         self._dc(1)
         self._cs(0)
-        if self.width < self.height:  # Portrait 214ms on RP2 120MHz, 30MHz SPI clock
+        # Portrait 214ms, landscape 264ms on RP2 120MHz, 30MHz SPI clock
+        self._wlines(0, self._long)
+        self._cs(1)
+
+    # Output physical lines first..last - 1 in batches of ._lines_per_write. In
+    # landscape mode physical line n is logical column width - 1 - n.
+    @micropython.native
+    def _wlines(self, first, last):
+        clut = ILI9486.lut
+        buf = self.mvb
+        cm = self._gscale  # color False, greyscale True
+        lw = self._short * 2  # Output bytes per physical line
+        nl = self._lines_per_write
+        lb = memoryview(self._linebuf)
+        slots = [lb[k * lw :] for k in range(nl)]
+        portrait = self.width < self.height
+        wd = self.width // 2
+        wc = self.width - 1
+        cargs = (self.height << 9) + (self.width << 18)  # Viper 4-arg limit
+        while first < last:
+            n = min(nl, last - first)  # Lines in this write
+            for k in range(n):
+                if portrait:
+                    _lcopy(slots[k], buf[first * wd :], clut, wd, cm)  # Copy and map colors
+                else:
+                    _lscopy(slots[k], buf, clut, wc - first + cargs, cm)
+                first += 1
+            self._spi.write(lb if n == nl else lb[: n * lw])
+
+    # Output a rectangle. In portrait mode columns are expanded to a byte
+    # boundary (2 pixels). In landscape mode the rectangle is output as a set
+    # of physical rows. The address window is restored on completion.
+    def _show_region(self, x0, y0, x1, y1):
+        self._dirty = None
+        clut = ILI9486.lut
+        buf = self.mvb
+        cm = self._gscale  # color False, greyscale True
+        if self._spi_init:  # A callback was passed
+            self._spi_init(self._spi)  # Bus may be shared
+        if self.width < self.height:  # Portrait
             wd = self.width // 2
-            ht = self.height
-            for start in range(0, wd * ht, wd):  # For each line
-                _lcopy(lb, buf[start:], clut, wd, cm)  # Copy and map colors
+            x0 &= 0xFFFE
+            x1 += x1 & 1
+            nb = (x1 - x0) >> 1  # Source bytes per row
+            lb = memoryview(self._linebuf)[: nb * 4]
+            self._wcd(b"\x2a", int.to_bytes((x0 << 16) + x1 - 1, 4, "big"))
+            self._wcd(b"\x2b", int.to_bytes((y0 << 16) + y1 - 1, 4, "big"))
+            self._wcmd(b"\x2c")  # WRITE_RAM
+            self._dc(1)
+            self._cs(0)
+            for start in range(y0 * wd + (x0 >> 1), y1 * wd, wd):  # For each line
+                _lcopy(lb, buf[start:], clut, nb, cm)  # Copy and map colors
                 self._spi.write(lb)
-        else:  # Landscpe 264ms on RP2 120MHz, 30MHz SPI clock
+        else:  # Landscape: logical column c is physical row width - 1 - c
             width = self.width
-            wd = width - 1
-            cargs = (self.height << 9) + (width << 18)  # Viper 4-arg limit
-            for col in range(width):  # For each column of landscape display
-                _lscopy(lb, buf, clut, wd - col + cargs, cm)  # Copy and map colors
+            lb = memoryview(self._linebuf)[: (y1 - y0) * 2]
+            src = buf[y0 * (width >> 1) :]  # Logical row y0 is physical column y0
+            cargs = ((y1 - y0) << 9) + (width << 18)  # Viper 4-arg limit
+            self._wcd(b"\x2a", int.to_bytes((y0 << 16) + y1 - 1, 4, "big"))
+            self._wcd(b"\x2b", int.to_bytes((width - x1 << 16) + width - x0 - 1, 4, "big"))
+            self._wcmd(b"\x2c")  # WRITE_RAM
+            self._dc(1)
+            self._cs(0)
+            for col in range(x1 - 1, x0 - 1, -1):  # For each column of landscape display
+                _lscopy(lb, src, clut, col + cargs, cm)  # Copy and map colors
                 self._spi.write(lb)
         self._cs(1)
+        if not self._hat:  # As in __init__, the HAT cannot accept these commands
+            self._wcd(b"\x2a", int.to_bytes(self._short - 1, 4, "big"))
+            self._wcd(b"\x2b", int.to_bytes(self._long - 1, 4, "big"))
 
     def short_lock(self, v=None):
         if v is not None:
@@ -192,42 +275,19 @@ class ILI9486(framebuf.FrameBuffer):
         if elock is None:
             elock = asyncio.Lock()
         async with self._lock:
+            self._dirty = None  # Whole frame is output
             lines, mod = divmod(self._long, split)  # Lines per segment
             if mod:
                 raise ValueError("Invalid do_refresh arg.")
-            clut = ILI9486.lut
-            lb = self._linebuf
-            buf = self.mvb
-            cm = self._gscale  # color False, greyscale True
             self._wcmd(b"\x2c")  # WRITE_RAM
             self._dc(1)
-            if self.width < self.height:  # Portrait: write sets of rows
-                wd = self.width // 2
-                line = 0
-                for _ in range(split):  # For each segment
-                    async with elock:
-                        if self._spi_init:  # A callback was passed
-                            self._spi_init(self._spi)  # Bus may be shared
-                        self._cs(0)
-                        for start in range(wd * line, wd * (line + lines), wd):  # For each line
-                            _lcopy(lb, buf[start:], clut, wd, cm)  # Copy and map colors
-                            self._spi.write(lb)
-                        line += lines
-                        self._cs(1)  # Allow other tasks to use bus
-                    await asyncio.sleep_ms(0)
-            else:  # Landscape: write sets of cols. lines is no. of cols per segment.
-                cargs = (self.height << 9) + (self.width << 18)  # Viper 4-arg limit
-                sc = self.width - 1  # Start and end columns
-                ec = sc - lines  # End column
-                for _ in range(split):  # For each segment
-                    async with elock:
-                        if self._spi_init:  # A callback was passed
-                            self._spi_init(self._spi)  # Bus may be shared
-                        self._cs(0)
-                        for col in range(sc, ec, -1):  # For each column of landscape display
-                            _lscopy(lb, buf, clut, col + cargs, cm)  # Copy and map colors
-                            self._spi.write(lb)
-                        sc -= lines
-                        ec -= lines
-                        self._cs(1)  # Allow other tasks to use bus
-                    await asyncio.sleep_ms(0)
+            line = 0  # Portrait: write sets of rows. Landscape: sets of cols.
+            for _ in range(split):  # For each segment
+                async with elock:
+                    if self._spi_init:  # A callback was passed
+                        self._spi_init(self._spi)  # Bus may be shared
+                    self._cs(0)
+                    self._wlines(line, line + lines)
+                    line += lines
+                    self._cs(1)  # Allow other tasks to use bus
+                await asyncio.sleep_ms(0)
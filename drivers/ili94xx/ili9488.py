@@ -22,6 +22,7 @@ import gc
 import framebuf
 import asyncio
 from drivers.boolpalette import BoolPalette
+from drivers.damage import damage_mode, damage
 
 # Do processing from end to beginning for
 # small performance improvement.
@@ -81,6 +82,8 @@ def _lcopy(dest: ptr8, source: ptr8, lut: ptr16, length: int):
 
 
 class ILI9488(framebuf.FrameBuffer):
+    damage_mode = damage_mode  # Damage tracking: see drivers/damage.py
+    damage = damage
 
     lut = bytearray(32)
     COLOR_INVERT = 0
@@ -128,6 +131,8 @@ class ILI9488(framebuf.FrameBuffer):
         self.mvb = memoryview(buf)
         super().__init__(buf, width, height, self.mode)  # Logical aspect ratio
         self._linebuf = bytearray(self._lines_per_write * self.width * 3)
+        self._dmode = False  # Damage tracking: .show sends only the dirty region
+        self._dirty = None  # Dirty rectangle [x0, y0, x1, y1] (x1, y1 exclusive)
 
         # Hardware reset
         self._rst(0)
@@ -185,6 +190,12 @@ class ILI9488(framebuf.FrameBuffer):
 
     # @micropython.native  # Made almost no difference to timing
     def show(self):  # Physical display is in portrait mode
+        if self._dmode:
+            d = self._dirty
+            if d is not None:
+                self._show_region(d[0], d[1], d[2], d[3])
+            return
+        self._dirty = None
         lb = self._linebuf
         buf = self.mvb
         cm = self._gscale  # color False, greyscale True
@@ -211,6 +222,38 @@ class ILI9488(framebuf.FrameBuffer):
                 spi_write(lb)
         self._cs(1)
 
+    # Output a rectangle. Columns are expanded to a byte boundary (2 pixels).
+    # The address window is restored on completion for .show and .do_refresh.
+    def _show_region(self, x0, y0, x1, y1):
+        self._dirty = None
+        wd = self.width >> 1
+        buf = self.mvb
+        x0 &= 0xFFFE
+        x1 += x1 & 1
+        nb = (x1 - x0) >> 1  # Source bytes per row
+        lb = memoryview(self._linebuf)[: nb * 6]
+        spi_write = self._spi.write
+        if self._spi_init:  # A callback was passed
+            self._spi_init(self._spi)  # Bus may be shared
+        self._wcd(b"\x2a", int.to_bytes((x0 << 16) + x1 - 1, 4, "big"))
+        self._wcd(b"\x2b", int.to_bytes((y0 << 16) + y1 - 1, 4, "big"))
+        self._wcmd(b"\x2c")  # WRITE_RAM
+        self._dc(1)
+        self._cs(0)
+        r = range(y0 * wd + (x0 >> 1), y1 * wd, wd)
+        if self._gscale:
+            for start in r:  # For each line
+                _lcopy_gs(lb, buf[start:], nb)
+                spi_write(lb)
+        else:
+            clut = ILI9488.lut
+            for start in r:
+                _lcopy(lb, buf[start:], clut, nb)
+                spi_write(lb)
+        self._cs(1)
+        self._wcd(b"\x2a", int.to_bytes(self.width - 1, 4, "big"))
+        self._wcd(b"\x2b", int.to_bytes(self.height - 1, 4, "big"))
+
     def short_lock(self, v=None):
         if v is not None:
             self.lock_mode = v  # If set, user lock is passed to .do_refresh
@@ -222,6 +265,7 @@ class ILI9488(framebuf.FrameBuffer):
         if elock is None:
             elock = asyncio.Lock()
         async with self._lock:
+            self._dirty = None  # Whole frame is output
             lines, mod = divmod(self.height, split)  # Lines per segment
             if mod:
                 raise ValueError("Invalid do_refresh arg 'split'")
@@ -88,6 +88,25 @@ _LOW_COLUMN_ADDRESS = const(0x00)
 _HIGH_COLUMN_ADDRESS = const(0x10)
 _SET_PAGE_ADDRESS = const(0xB0)
 
+
+# Remap dirty pages of the HMSB render buffer into the VLSB display buffer when
+# rotate90 is set. Display page n comprises byte n of each row of renderbuf.
+@micropython.viper
+def _remap(db: ptr8, rb: ptr8, wp: int, pages_to_update: int):
+    w = wp >> 8  # Unpack width and no. of pages
+    p = wp & 0xFF
+    page = 0
+    while page < p:
+        if pages_to_update & (1 << page):
+            d = w * page
+            end = d + w
+            i = page
+            while d < end:
+                db[d] = rb[i]
+                i += p
+                d += 1
+        page += 1
+
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
 class SH1106(framebuf.FrameBuffer):
@@ -165,13 +184,12 @@ class SH1106(framebuf.FrameBuffer):
     def show(self, full_update=False):
         # self.* lookups in loops take significant time (~4fps).
         (w, p, db, rb) = (self.width, self.pages, self.displaybuf, self.renderbuf)
-        if self.rotate90:
-            for i in range(self.bufsize):
-                db[w * (i % p) + (i // p)] = rb[i]
         if full_update:
             pages_to_update = (1 << self.pages) - 1
         else:
             pages_to_update = self.pages_to_update
+        if self.rotate90:
+            _remap(db, rb, (w << 8) | p, pages_to_update)
         # print("Updating pages: {:08b}".format(pages_to_update))
         for page in range(self.pages):
             if pages_to_update & (1 << page):
@@ -186,24 +204,23 @@ class SH1106(framebuf.FrameBuffer):
             return super().pixel(x, y)
         else:
             super().pixel(x, y, color)
-            page = y // 8
-            self.pages_to_update |= 1 << page
+            self.register_updates(y, y, x, x)
 
     def text(self, text, x, y, color=1):
         super().text(text, x, y, color)
-        self.register_updates(y, y + 7)
+        self.register_updates(y, y + 7, x, x + 8 * len(text) - 1)
 
     def line(self, x0, y0, x1, y1, color):
         super().line(x0, y0, x1, y1, color)
-        self.register_updates(y0, y1)
+        self.register_updates(y0, y1, x0, x1)
 
     def hline(self, x, y, w, color):
         super().hline(x, y, w, color)
-        self.register_updates(y)
+        self.register_updates(y, y, x, x + w - 1)
 
     def vline(self, x, y, h, color):
         super().vline(x, y, h, color)
-        self.register_updates(y, y + h - 1)
+        self.register_updates(y, y + h - 1, x, x)
 
     def fill(self, color):
         super().fill(color)
@@ -211,7 +228,7 @@ class SH1106(framebuf.FrameBuffer):
 
     def blit(self, fbuf, x, y, key=-1, palette=None):
         super().blit(fbuf, x, y, key, palette)
-        self.register_updates(y, y + self.height)
+        self.register_updates(y, y + self.height, x, x + self.width)
 
     def scroll(self, x, y):
         # my understanding is that scroll() does a full screen change
@@ -220,16 +237,22 @@ class SH1106(framebuf.FrameBuffer):
 
     def fill_rect(self, x, y, w, h, color):
         super().fill_rect(x, y, w, h, color)
-        self.register_updates(y, y + h - 1)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
 
     def rect(self, x, y, w, h, color):
         super().rect(x, y, w, h, color)
-        self.register_updates(y, y + h - 1)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
 
-    def register_updates(self, y0, y1=None):
+    def register_updates(self, y0, y1=None, x0=None, x1=None):
         # this function takes the top and optional bottom address of the changes made
         # and updates the pages_to_change list with any changed pages
         # that are not yet on the list
+        if self.rotate90:
+            # Display pages lie along the x axis of the render buffer.
+            if x0 is None:
+                self.pages_to_update = (1 << self.pages) - 1
+                return
+            y0, y1 = x0, x1
         start_page = max(0, y0 // 8)
         end_page = max(0, y1 // 8) if y1 is not None else start_page
         # rearrange start_page and end_page if coordinates were given from bottom to top
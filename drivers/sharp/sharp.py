@@ -22,12 +22,41 @@ _WRITECMD = const(1)  # Command bits
 _VCOM = const(2)
 
 
+# Compare each line of the frame buffer with its shadow. Changed lines are
+# flagged and copied to the shadow. Returns the number of changed lines.
+@micropython.viper
+def _diff(buf: ptr8, shadow: ptr8, flags: ptr8, bh: int) -> int:
+    bpl = bh >> 16  # Unpack bytes per line and height
+    height = bh & 0xFFFF
+    n = 0  # No. of changed lines
+    idx = 0
+    line = 0
+    while line < height:
+        end = idx + bpl
+        i = idx
+        while i < end:
+            if buf[i] != shadow[i]:
+                break
+            i += 1
+        if i < end:  # Line has changed
+            while i < end:
+                shadow[i] = buf[i]
+                i += 1
+            flags[line] = 1
+            n += 1
+        else:
+            flags[line] = 0
+        idx = end
+        line += 1
+    return n
+
+
 class SHARP(framebuf.FrameBuffer):
     @staticmethod
     def rgb(r, g, b):
         return int((r > 127) or (g > 127) or (b > 127))
 
-    def __init__(self, spi, pincs, height=240, width=400, vcom=False):
+    def __init__(self, spi, pincs, height=240, width=400, vcom=False, diff=False):
         spi.init(baudrate=2_000_000, firstbit=machine.SPI.LSB)  # Data sheet: should support 2MHz
         self._spi = spi
         self._pincs = pincs
@@ -40,21 +69,36 @@ class SHARP(framebuf.FrameBuffer):
         self._cmd[0] = _WRITECMD | _VCOM if vcom else _WRITECMD
         self._lno = bytearray(1)  # Line no.
         self._dummy = bytearray(1)  # Dummy (0)
+        # In diff mode a shadow copy of the buffer enables .show to send only
+        # the lines which have changed.
+        self._shadow = bytearray(len(self._buffer)) if diff else None
+        self._flags = bytearray(self.height) if diff else None
+        self._full = True  # Send all lines on first .show
 
     # .show should be called periodically to avoid frame inversion flag
     # (VCOM) retaining the same value for long periods
     def show(self):
         spi = self._spi
         bpl = self.width // 8  # Bytes per line
+        flags = self._flags
+        if flags is not None:  # diff mode
+            if self._full:
+                self._full = False
+                self._shadow[:] = self._buffer
+                flags = None  # Send all lines
+            elif not _diff(self._buffer, self._shadow, flags, (bpl << 16) | self.height):
+                self.update()  # Nothing has changed: toggle VCOM only
+                return
         self._pincs(1)  # CS is active high
         spi.write(self._cmd)
         start = 0
         lno = self._lno
         lno[0] = 1  # Gate line address (starts at 1)
-        for _ in range(self.height):
-            spi.write(lno)
-            spi.write(self._mvb[start : start + bpl])
-            spi.write(self._dummy)
+        for n in range(self.height):
+            if flags is None or flags[n]:
+                spi.write(lno)
+                spi.write(self._mvb[start : start + bpl])
+                spi.write(self._dummy)
             start += bpl
             lno[0] += 1  # Gate line address
         spi.write(self._dummy)
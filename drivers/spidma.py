@@ -0,0 +1,64 @@
+# spidma.py Background SPI output for color display drivers.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# MicroPython's SPI.write blocks. On RP2 a DMA channel can feed the SPI TX FIFO
+# so that a driver can convert the next line while the previous one is sent.
+# spidma(spi) returns an SPIDMA instance or None if the port or bus (e.g.
+# SoftSPI) does not support this, in which case drivers use blocking writes.
+
+import sys
+from micropython import const
+from machine import mem32
+
+_SSPDR = const(0x08)  # PL022 data register
+_SSPSR = const(0x0C)  # Status register
+_SSPICR = const(0x20)  # Interrupt clear register
+_BSY = const(0x10)
+_RNE = const(0x04)
+# (Peripheral base address, TX DREQ) for SPI0 and SPI1
+_RP2040 = ((0x4003C000, 16), (0x40040000, 18))
+_RP2350 = ((0x40080000, 24), (0x40088000, 26))
+
+
+def spidma(spi):
+    try:
+        from rp2 import DMA
+    except ImportError:
+        return None
+    s = str(spi)  # e.g. SPI(0, baudrate=...
+    if not s.startswith("SPI("):  # SoftSPI
+        return None
+    regs = _RP2350 if "RP2350" in sys.implementation._machine else _RP2040
+    base, dreq = regs[int(s[4])]
+    return SPIDMA(DMA(), base, dreq)
+
+
+class SPIDMA:
+    def __init__(self, dma, base, dreq):
+        self._dma = dma
+        self._base = base
+        self._ctrl = dma.pack_ctrl(size=0, inc_write=False, treq_sel=dreq)
+
+    # Start sending a buffer. It must not be altered until .wait returns.
+    def write(self, buf):
+        self._dma.config(
+            read=buf, write=self._base + _SSPDR, count=len(buf), ctrl=self._ctrl, trigger=True
+        )
+
+    # Wait until the last byte has been clocked out. Data received during the
+    # transfer is discarded so that the bus is left as SPI.write leaves it.
+    def wait(self):
+        dma = self._dma
+        base = self._base
+        while dma.active():
+            pass
+        while mem32[base + _SSPSR] & _BSY:
+            pass
+        while mem32[base + _SSPSR] & _RNE:
+            mem32[base + _SSPDR]
+        mem32[base + _SSPICR] = 1  # Clear RX overrun
+
+    def deinit(self):
+        self._dma.close()
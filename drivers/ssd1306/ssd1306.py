@@ -1,4 +1,6 @@
 # MicroPython SSD1306 OLED driver, I2C and SPI interfaces
+# Extended with page-granular dirty tracking: .show only transfers the pages
+# and columns changed by graphics methods since the last call.
 
 from micropython import const
 import framebuf
@@ -36,6 +38,10 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
+        self._mvb = memoryview(self.buffer)
+        self.pages_to_update = 0  # Bitmap of dirty pages
+        self._cx0 = self.width  # Dirty column range (inclusive)
+        self._cx1 = -1
         mode = framebuf.MONO_VLSB
         self.palette = BoolPalette(mode)  # Ensure color compatibility
         super().__init__(self.buffer, self.width, self.height, mode)
@@ -91,20 +97,121 @@ class SSD1306(framebuf.FrameBuffer):
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
-    def show(self):
-        x0 = 0
-        x1 = self.width - 1
-        if self.width == 64:
-            # displays with width of 64 pixels are shifted by 32
-            x0 += 32
-            x1 += 32
+    def show(self, full_update=False):
+        if full_update:
+            self.register_updates(0, self.height - 1)
+        pages_to_update = self.pages_to_update
+        if not pages_to_update:
+            return
+        w = self.width
+        cx0 = self._cx0
+        cx1 = self._cx1
+        self.pages_to_update = 0
+        self._cx0 = w
+        self._cx1 = -1
+        offs = 32 if w == 64 else 0  # displays with width of 64 pixels are shifted by 32
         self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        self.write_cmd(cx0 + offs)
+        self.write_cmd(cx1 + offs)
+        mvb = self._mvb
+        page = 0
+        while page < self.pages:
+            if pages_to_update & (1 << page):
+                end = page  # Find a run of consecutive dirty pages
+                while end + 1 < self.pages and pages_to_update & (1 << (end + 1)):
+                    end += 1
+                self.write_cmd(SET_PAGE_ADDR)
+                self.write_cmd(page)
+                self.write_cmd(end)
+                if cx0 == 0 and cx1 == w - 1:  # Full width: pages are contiguous
+                    self.write_data(mvb[w * page : w * (end + 1)])
+                else:
+                    for p in range(page, end + 1):
+                        self.write_data(mvb[w * p + cx0 : w * p + cx1 + 1])
+                page = end
+            page += 1
+
+    def pixel(self, x, y, color=None):
+        if color is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, color)
+        self.register_updates(y, y, x, x)
+
+    def text(self, text, x, y, color=1):
+        super().text(text, x, y, color)
+        self.register_updates(y, y + 7, x, x + 8 * len(text) - 1)
+
+    def line(self, x0, y0, x1, y1, color):
+        super().line(x0, y0, x1, y1, color)
+        self.register_updates(y0, y1, x0, x1)
+
+    def hline(self, x, y, w, color):
+        super().hline(x, y, w, color)
+        self.register_updates(y, y, x, x + w - 1)
+
+    def vline(self, x, y, h, color):
+        super().vline(x, y, h, color)
+        self.register_updates(y, y + h - 1, x, x)
+
+    def fill(self, color):
+        super().fill(color)
+        self.register_updates(0, self.height - 1)
+
+    # A FrameBuffer does not expose its size: unless the source has width and
+    # height attributes assume that it extends to the edge of the display.
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        super().blit(fbuf, x, y, key, palette)
+        h = getattr(fbuf, "height", self.height)
+        w = getattr(fbuf, "width", self.width)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def scroll(self, x, y):
+        super().scroll(x, y)
+        self.register_updates(0, self.height - 1)
+
+    def fill_rect(self, x, y, w, h, color):
+        super().fill_rect(x, y, w, h, color)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def rect(self, x, y, w, h, color, fill=False):
+        super().rect(x, y, w, h, color, fill)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def ellipse(self, x, y, xr, yr, color, fill=False, m=0x0F):
+        super().ellipse(x, y, xr, yr, color, fill, m)
+        self.register_updates(y - yr, y + yr, x - xr, x + xr)
+
+    def poly(self, x, y, coords, color, fill=False):
+        super().poly(x, y, coords, color, fill)
+        xs = coords[0::2]
+        ys = coords[1::2]
+        if len(ys):
+            self.register_updates(y + min(ys), y + max(ys), x + min(xs), x + max(xs))
+
+    # Record a changed area reported by the GUI, e.g. the extent of text.
+    def damage(self, x, y, w, h):
+        if w > 0 and h > 0:
+            self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    # Record a changed area defined by top and bottom rows and optional left and
+    # right columns. Coordinates may be in any order and outside the display.
+    def register_updates(self, y0, y1, x0=0, x1=None):
+        if y0 > y1:
+            y0, y1 = y1, y0
+        y0 = max(0, y0)
+        y1 = min(self.height - 1, y1)
+        if x1 is None:
+            x1 = self.width - 1
+        elif x0 > x1:
+            x0, x1 = x1, x0
+        x0 = max(0, x0)
+        x1 = min(self.width - 1, x1)
+        if y0 > y1 or x0 > x1:  # Entirely off screen
+            return
+        for page in range(y0 >> 3, (y1 >> 3) + 1):
+            self.pages_to_update |= 1 << page
+        self._cx0 = min(self._cx0, x0)
+        self._cx1 = max(self._cx1, x1)
 
 
 class SSD1306_I2C(SSD1306):
@@ -77,7 +77,7 @@ class SSD1351(framebuf.FrameBuffer):
     def rgb(r, g, b):
         return (r & 0xf8) << 5 | (g & 0x1c) << 11 | (g & 0xe0) >> 5 | (b & 0xf8)
 
-    def __init__(self, spi, pincs, pindc, pinrs, height=128, width=128, init_spi=False):
+    def __init__(self, spi, pincs, pindc, pinrs, height=128, width=128, init_spi=False, lines_per_write=1):
         if height not in (96, 128):
             raise ValueError('Unsupported height {}'.format(height))
         self.spi = spi
@@ -91,7 +91,8 @@ class SSD1351(framebuf.FrameBuffer):
         gc.collect()
         self.buffer = bytearray(self.height * self.width // 2)
         super().__init__(self.buffer, self.width, self.height, mode)
-        self.linebuf = bytearray(self.width * 2)
+        self.lines_per_write = lines_per_write  # Lines converted per SPI write
+        self.linebuf = bytearray(self.width * 2 * lines_per_write)
         pinrs(0)  # Pulse the reset line
         utime.sleep_ms(1)
         pinrs(1)
@@ -117,27 +118,28 @@ class SSD1351(framebuf.FrameBuffer):
     # SSD1351 RAM to the OLED device.
     def show(self):  # 44ms on Pyboard 1.x
         clut = SSD1351.lut
-        lb = self.linebuf
         wd = self.width // 2
+        lw = self.width * 2  # Bytes per output line
+        nl = self.lines_per_write
+        lb = memoryview(self.linebuf)
+        slots = [lb[k * lw :] for k in range(nl)]
         buf = memoryview(self.buffer)
+        h128 = self.height == 128
         if self.spi_init:  # A callback was passed
             self.spi_init(self.spi)  # Bus may be shared
         self._write(b'\x5c', 0)  # Enable data write
-        if self.height == 128:
-            for l in range(128):
-                l0 = (95 - l) % 128  # 95 94 .. 1 0 127 126...
-                start = l0 * wd
-                _lcopy(lb, buf[start : start + wd], clut, wd)
-                self._write(lb, 1)  # Send a line
-        else:
-            for l in range(128):
-                if l < 64:
-                    start = (63 -l) * wd
-                    _lcopy(lb, buf[start : start + wd], clut, wd)
-                elif l < 96:  # This is daft but I can't get setrow to work
-                    pass  # Let RAM counter increase
+        for l in range(0, 128, nl):
+            n = min(nl, 128 - l)  # Lines in this write
+            for k in range(n):
+                m = l + k
+                if h128:
+                    start = (95 - m) % 128 * wd  # 95 94 .. 1 0 127 126...
+                elif m < 64:
+                    start = (63 - m) * wd
+                elif m < 96:  # This is daft but I can't get setrow to work
+                    continue  # Let RAM counter increase
                 else:
-                    start = (191 - l) * wd
-                    _lcopy(lb, buf[start : start + wd], clut, wd)
-                self._write(lb, 1)  # Send a line
+                    start = (191 - m) * wd
+                _lcopy(slots[k], buf[start : start + wd], clut, wd)
+            self._write(lb if n == nl else lb[: n * lw], 1)  # Send lines
 
@@ -53,7 +53,7 @@ class ST7735R(framebuf.FrameBuffer):
         return (b & 0xf8) << 5 | (g & 0x1c) << 11 | (g & 0xe0) >> 5 | (r & 0xf8)
 
     # rst and cs are active low, SPI is mode 0
-    def __init__(self, spi, cs, dc, rst, height=128, width=160, usd=False, init_spi=False):
+    def __init__(self, spi, cs, dc, rst, height=128, width=160, usd=False, init_spi=False, lines_per_write=1):
         self._spi = spi
         self._rst = rst  # Pins
         self._dc = dc
@@ -67,7 +67,8 @@ class ST7735R(framebuf.FrameBuffer):
         buf = bytearray(height * width // 2)
         self._mvb = memoryview(buf)
         super().__init__(buf, width, height, mode)
-        self._linebuf = bytearray(self.width * 2)  # 16 bit color out
+        self._lines_per_write = lines_per_write  # Lines converted per SPI write
+        self._linebuf = bytearray(self.width * 2 * lines_per_write)  # 16 bit color out
         self._init(usd)
         self.show()
 
@@ -144,7 +145,10 @@ class ST7735R(framebuf.FrameBuffer):
         clut = ST7735R.lut
         wd = self.width // 2
         ht = self.height
-        lb = self._linebuf
+        lw = self.width * 2  # Bytes per output line
+        nl = self._lines_per_write
+        lb = memoryview(self._linebuf)
+        slots = [lb[k * lw :] for k in range(nl)]
         buf = self._mvb
         self._dc(0)
         self._cs(0)
@@ -152,7 +156,11 @@ class ST7735R(framebuf.FrameBuffer):
             self._spi_init(self._spi)  # Bus may be shared
         self._spi.write(b'\x2c')  # RAMWR
         self._dc(1)
-        for start in range(wd * (ht - 1), -1, - wd):  # For each line
-            _lcopy(lb, buf[start :], clut, wd)  # Copy and map colors
-            self._spi.write(lb)
+        start = wd * (ht - 1)  # Lines are sent bottom up
+        while start >= 0:
+            n = min(nl, start // wd + 1)  # Lines in this write
+            for k in range(n):
+                _lcopy(slots[k], buf[start :], clut, wd)  # Copy and map colors
+                start -= wd
+            self._spi.write(lb if n == nl else lb[: n * lw])
         self._cs(1)
@@ -22,6 +22,7 @@ import gc
 import micropython
 import asyncio
 from drivers.boolpalette import BoolPalette
+from drivers.damage import damage_mode, damage
 
 # User orientation constants
 # Waveshare Pico res touch defaults to portrait. Requires PORTRAIT for landscape orientation.
@@ -64,6 +65,8 @@ def _lcopy(dest: ptr16, source: ptr8, lut: ptr16, length: int, gscale: bool):
 
 
 class ST7789(framebuf.FrameBuffer):
+    damage_mode = damage_mode  # Damage tracking: see drivers/damage.py
+    damage = damage
 
     lut = bytearray(0xFF for _ in range(32))  # set all colors to BLACK
 
@@ -87,6 +90,7 @@ class ST7789(framebuf.FrameBuffer):
         disp_mode=LANDSCAPE,
         init_spi=False,
         display=GENERIC,
+        lines_per_write=1,
     ):
         if not 0 <= disp_mode <= 7:
             raise ValueError("Invalid display mode:", disp_mode)
@@ -108,7 +112,13 @@ class ST7789(framebuf.FrameBuffer):
         buf = bytearray(height * -(-width // 2))  # Ceiling division for odd widths
         self.mvb = memoryview(buf)
         super().__init__(buf, width, height, self.mode)
-        self._linebuf = bytearray(self.width * 2)  # 16 bit color out
+        self._lines_per_write = lines_per_write
+        # 16 bit color out. Lines hold an even no. of pixels.
+        self._linebuf = bytearray(-(-width // 2) * 4 * lines_per_write)
+        self._ppong = False  # Ping-pong mode (see .ping_pong)
+        self._dma = None
+        self._dmode = False  # Damage tracking: .show sends only the dirty region
+        self._dirty = None  # Dirty rectangle [x0, y0, x1, y1] (x1, y1 exclusive)
         self._init(disp_mode, orientation, display[3:])
         self.show()
 
@@ -219,6 +229,7 @@ class ST7789(framebuf.FrameBuffer):
                 xs = rwd - wwd - xoff
                 xe = rwd - xoff - 1
 
+        self._win = (xs, xe, ys, ye)  # Restored after a region write
         # Col address set.
         self._wcd(b"\x2a", int.to_bytes((xs << 16) + xe, 4, "big"))
         # Row address set
@@ -234,23 +245,105 @@ class ST7789(framebuf.FrameBuffer):
         # Blocks for 60ms @30MHz SPI on TTGO in PORTRAIT mode
         # Blocks for 46ms @30MHz SPI on TTGO in LANDSCAPE mode
         # ts = ticks_us()
-        clut = ST7789.lut
+        if self._dmode:
+            d = self._dirty
+            if d is not None:
+                self._show_region(d[0], d[1], d[2], d[3])
+            return
+        self._dirty = None
         wd = -(-self.width // 2)  # Ceiling division for odd number widths
         end = self.height * wd
-        lb = memoryview(self._linebuf)
+        if self._spi_init:  # A callback was passed
+            self._spi_init(self._spi)  # Bus may be shared
+        self._dc(0)
+        self._cs(0)
+        self._spi.write(b"\x2c")  # RAMWR
+        self._dc(1)
+        self._wlines(0, end)
+        self._cs(1)
+        # print(ticks_diff(ticks_us(), ts))
+
+    # Output a rectangle. Columns are expanded to a byte boundary (2 pixels).
+    # The address window is restored on completion for .show and .do_refresh.
+    def _show_region(self, x0, y0, x1, y1):
+        self._dirty = None
+        clut = ST7789.lut
+        wd = -(-self.width // 2)
         cm = self._gscale  # color False, greyscale True
         buf = self.mvb
+        xs, xe, ys, ye = self._win
+        x0 &= 0xFFFE
+        nb = (x1 - x0 + 1) >> 1  # Source bytes per row
+        lb = memoryview(self._linebuf)[: (x1 - x0) * 2]
         if self._spi_init:  # A callback was passed
             self._spi_init(self._spi)  # Bus may be shared
+        self._wcd(b"\x2a", int.to_bytes((xs + x0 << 16) + xs + x1 - 1, 4, "big"))
+        self._wcd(b"\x2b", int.to_bytes((ys + y0 << 16) + ys + y1 - 1, 4, "big"))
         self._dc(0)
         self._cs(0)
         self._spi.write(b"\x2c")  # RAMWR
         self._dc(1)
-        for start in range(0, end, wd):
-            _lcopy(lb, buf[start:], clut, wd, cm)  # Copy and map colors
+        for start in range(y0 * wd + (x0 >> 1), y1 * wd, wd):
+            _lcopy(lb, buf[start:], clut, nb, cm)  # Copy and map colors
             self._spi.write(lb)
         self._cs(1)
-        # print(ticks_diff(ticks_us(), ts))
+        self._wcd(b"\x2a", int.to_bytes((xs << 16) + xe, 4, "big"))
+        self._wcd(b"\x2b", int.to_bytes((ys << 16) + ye, 4, "big"))
+
+    # Enable or disable ping-pong mode. Each batch of lines is converted while DMA
+    # sends the previous one. Without non-blocking SPI the batch size is doubled.
+    def ping_pong(self, v=None):
+        if v is not None and bool(v) != self._ppong:
+            self._ppong = bool(v)
+            if self._dma is not None:
+                self._dma.deinit()
+                self._dma = None
+            self._linebuf = None
+            gc.collect()
+            if v:
+                from drivers.spidma import spidma
+
+                self._dma = spidma(self._spi)
+            self._linebuf = bytearray(-(-self.width // 2) * 4 * self._lines_per_write * (2 if v else 1))
+        return self._ppong
+
+    # Output full lines of the frame buffer between byte offsets start and end.
+    # Lines are converted and sent in batches of up to ._lines_per_write.
+    # _lcopy outputs an even number of pixels so lines are pitched accordingly.
+    @micropython.native
+    def _wlines(self, start, end):
+        clut = ST7789.lut
+        wd = -(-self.width // 2)  # Ceiling division for odd widths
+        lw = self.width * 2  # Output bytes per line
+        lp = wd * 4  # Line pitch in buffer
+        cm = self._gscale  # color False, greyscale True
+        buf = self.mvb
+        lb = memoryview(self._linebuf)
+        dma = self._dma
+        nl = len(lb) // lp  # Lines per buffer
+        if dma is not None:
+            nl >>= 1  # Ping-pong between two buffers
+        if lw != lp:  # Odd width: lines in buffer are not contiguous
+            nl = 1
+        nb = 1 if dma is None else 2  # No. of buffers
+        slots = [lb[k * lp :] for k in range(nl * nb)]
+        outs = [lb[k * nl * lp : (k * nl + nl - 1) * lp + lw] for k in range(nb)]
+        i = 0  # Current buffer
+        while start < end:
+            n = min(nl, (end - start) // wd)  # Lines in this batch
+            b = i * nl
+            for k in range(b, b + n):
+                _lcopy(slots[k], buf[start:], clut, wd, cm)  # Copy and map colors
+                start += wd
+            out = outs[i] if n == nl else lb[b * lp : (b + n - 1) * lp + lw]
+            if dma is None:
+                self._spi.write(out)
+            else:  # Convert into one buffer while the other is sent
+                dma.wait()
+                dma.write(out)
+                i ^= 1
+        if dma is not None:
+            dma.wait()
 
     def short_lock(self, v=None):
         if v is not None:
@@ -263,14 +356,11 @@ class ST7789(framebuf.FrameBuffer):
         if elock is None:
             elock = asyncio.Lock()
         async with self._lock:
+            self._dirty = None  # Whole frame is output
             lines, mod = divmod(self.height, split)  # Lines per segment
             if mod:
                 raise ValueError("Invalid do_refresh arg.")
-            clut = ST7789.lut
             wd = -(-self.width // 2)
-            lb = memoryview(self._linebuf)
-            cm = self._gscale  # color False, greyscale True
-            buf = self.mvb
             line = 0
             for n in range(split):
                 async with elock:
@@ -280,9 +370,7 @@ class ST7789(framebuf.FrameBuffer):
                     self._cs(0)
                     self._spi.write(b"\x3c" if n else b"\x2c")  # RAMWR/Write memory continue
                     self._dc(1)
-                    for start in range(wd * line, wd * (line + lines), wd):
-                        _lcopy(lb, buf[start:], clut, wd, cm)  # Copy and map colors
-                        self._spi.write(lb)
+                    self._wlines(wd * line, wd * (line + lines))
                     line += lines
                     self._cs(1)
                 await asyncio.sleep(0)
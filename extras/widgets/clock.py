@@ -36,7 +36,8 @@ class Clock(DObject):
         self.show()
 
     def show(self):
-        super().show()
+        super().show()  # Blanks the dial
+        self._dial._set_pend(self._dial)  # Redraw it even if pointers are unchanged
         t = super().value()
         # Return a unit vector of phase phi. Multiplying by this will
         # rotate a vector anticlockwise which is mathematically correct.
@@ -0,0 +1,322 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# font_cvt.py Convert Python fonts created by font_to_py.py to files which
+# gui/core/fontfile.py reads a glyph at a time, or to sparse Python fonts.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+import argparse
+import ast
+import importlib.util
+import os
+import string
+import struct
+import sys
+
+VERSION = 1
+REVERSE = 1  # Header flags
+MONO = 2
+SPARSE = 4
+
+
+# A font comprises a dict of glyphs indexed by code point, each glyph being
+# (width, bitmap), and the default glyph rendered for missing chars.
+class Font:
+    def __init__(self, height, max_width, baseline, reverse, mono, default):
+        self.height = height
+        self.max_width = max_width
+        self.baseline = baseline
+        self.reverse = reverse
+        self.mono = mono
+        self.default = default
+        self.glyphs = {}
+        self.aliases = set()  # Chars in a source font rendered as the default
+
+    def add(self, font):
+        if font.height != self.height or font.reverse != self.reverse:
+            quit("Fonts must have the same height and mapping.")
+        for cp, g in font.glyphs.items():
+            self.glyphs.setdefault(cp, g)
+        self.aliases |= font.aliases
+        self.max_width = max(self.max_width, font.max_width)
+
+    # Restrict the font to a set of code points. Return those not in the font.
+    def select(self, cps):
+        self.glyphs = {cp: g for cp, g in self.glyphs.items() if cp in cps}
+        return cps - self.glyphs.keys() - self.aliases
+
+
+# Import a Python font module and extract its glyphs. Chars rendered as the
+# default glyph are treated as missing.
+def readpy(filename):
+    name = os.path.splitext(os.path.basename(filename))[0]
+    spec = importlib.util.spec_from_file_location(name, filename)
+    mod = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(mod)
+    except Exception as e:
+        quit(f"Cannot import {filename}: {e}")
+    if not hasattr(mod, "get_ch") or not mod.hmap():
+        quit(f"{filename} is not a horizontally mapped font.")
+    # Early fonts have no min_ch, max_ch and cover 32..126
+    mn = mod.min_ch() if hasattr(mod, "min_ch") else 32
+    mx = mod.max_ch() if hasattr(mod, "max_ch") else 126
+    if hasattr(mod, "_cp"):  # Sparse font
+        cps = struct.unpack(f"<{len(mod._cp) // 2}H", mod._cp)
+    else:
+        cps = range(mn, mx + 1)
+    fmt = lambda g: (g[2], bytes(g[0]))
+    default = fmt(mod.get_ch(chr(mx + 1)))
+    baseline = mod.baseline() if hasattr(mod, "baseline") else 0
+    font = Font(mod.height(), mod.max_width(), baseline, mod.reverse(), mod.monospaced(), default)
+    for cp in cps:
+        g = fmt(mod.get_ch(chr(cp)))
+        if g != default:
+            font.glyphs[cp] = g
+        else:
+            font.aliases.add(cp)
+    return font
+
+
+# Read a binary font file.
+def readbin(filename):
+    with open(filename, "rb") as f:
+        hdr = f.read(16)
+        if hdr[:3] != bytes((ord("N"), ord("F"), VERSION)):
+            quit(f"{filename} is not a font file.")
+        flags = hdr[3]
+        height, max_width, baseline, mn, mx, n = struct.unpack("<6H", hdr[4:])
+        widths = struct.unpack(f"<{n}H", f.read(2 * n))
+        if flags & SPARSE:
+            cps = struct.unpack(f"<{n - 1}H", f.read(2 * (n - 1)))
+        else:
+            cps = range(mn, mx + 1)
+        glyphs = [(w, f.read(((w + 7) >> 3) * height)) for w in widths]
+    font = Font(height, max_width, baseline, bool(flags & REVERSE), bool(flags & MONO), glyphs[0])
+    for cp, g in zip(cps, glyphs[1:]):
+        if g[0]:
+            font.glyphs[cp] = g
+        else:  # Width 0: rendered as the default
+            font.aliases.add(cp)
+    return font
+
+
+def readfont(filename):
+    if not os.path.isfile(filename):
+        quit(f"Source font {filename} does not exist")
+    return readpy(filename) if filename.upper().endswith(".PY") else readbin(filename)
+
+
+# Return the set of chars in string literals in Python sources. Paths may be
+# files or directories, which are searched recursively. Docstrings and the
+# fields of format strings are ignored.
+def scan(paths):
+    chars = set()
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in names if n.endswith(".py"))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            quit(f"{path} does not exist.")
+    for fn in files:
+        try:
+            with open(fn, encoding="utf-8") as f:
+                tree = ast.parse(f.read(), fn)
+        except (SyntaxError, UnicodeDecodeError) as e:
+            print(f"Warning: {fn} not scanned: {e}")
+            continue
+        skip = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+                skip.add(id(node.value))  # Docstring or other bare string
+            elif isinstance(node, ast.FormattedValue) and node.format_spec is not None:
+                skip.update(id(n) for n in ast.walk(node.format_spec))  # f-string spec
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in skip:
+                try:  # Literal text of a string which may be used with .format
+                    chars.update("".join(t[0] for t in string.Formatter().parse(node.value)))
+                except ValueError:
+                    chars.update(node.value)
+    return chars
+
+
+# Binary font: dense if holes (missing chars) would cost less than a table of
+# code points. A hole has width 0.
+def writebin(font, filename):
+    cps = sorted(font.glyphs)
+    if cps[-1] > 0xFFFF:
+        quit("Code points above 0xFFFF are not supported.")
+    mn, mx = cps[0], cps[-1]
+    sparse = mx - mn + 1 > 2 * len(cps)
+    if not sparse:
+        cps = range(mn, mx + 1)
+    glyphs = [font.default] + [font.glyphs.get(cp, (0, b"")) for cp in cps]
+    flags = (REVERSE if font.reverse else 0) | (MONO if font.mono else 0) | (SPARSE if sparse else 0)
+    n = len(glyphs)
+    with open(filename, "wb") as f:
+        f.write(b"NF" + bytes((VERSION, flags)))
+        f.write(struct.pack("<6H", font.height, font.max_width, font.baseline, mn, mx, n))
+        f.write(struct.pack(f"<{n}H", *(w for w, _ in glyphs)))
+        if sparse:
+            f.write(struct.pack(f"<{n - 1}H", *cps))
+        for _, data in glyphs:
+            f.write(data)
+        return f.tell()
+
+
+# Write bytes as Python source
+def pybytes(f, name, data):
+    f.write(f"{name} =\\\n")
+    for n in range(0, len(data), 16):
+        s = "".join(f"\\x{b:02x}" for b in data[n : n + 16])
+        f.write(f"b'{s}'")
+        f.write("\\\n" if n + 16 < len(data) else "\n")
+    if not data:
+        f.write("b''\n")
+    f.write("\n")
+
+
+# Sparse Python font. _cp holds sorted code points, _index the offset of each
+# glyph in _font preceded by the default glyph's offset. _ascii maps chars
+# 32..126 directly to glyph indices (0 if absent).
+GET_CH = """_mvfont = memoryview(_font)
+_mvi = memoryview(_index)
+_mvc = memoryview(_cp)
+ifb = lambda l : l[0] | (l[1] << 8)
+
+def _find(oc):
+    if 32 <= oc <= 126:
+        return _ascii[oc - 32]
+    lo = 0
+    hi = len(_cp) >> 1
+    while lo < hi:  # Binary search of code points
+        mid = (lo + hi) >> 1
+        c = ifb(_mvc[mid << 1 :])
+        if c < oc:
+            lo = mid + 1
+        elif c > oc:
+            hi = mid
+        else:
+            return mid + 1
+    return 0
+
+def get_ch(ch):
+    i = _mvi[_find(ord(ch)) * {isize} :]
+    doff = {doff}
+    width = ifb(_mvfont[doff : ])
+
+    next_offs = doff + 2 + ((width - 1)//8 + 1) * {height}
+    return _mvfont[doff + 2:next_offs], {height}, width
+"""
+
+
+def writepy(font, f, source):
+    cps = sorted(font.glyphs)
+    if cps[-1] > 0xFFFF:
+        quit("Code points above 0xFFFF are not supported.")
+    data = bytearray()
+    index = []
+    for w, bmp in [font.default] + [font.glyphs[cp] for cp in cps]:
+        index.append(len(data))
+        data += struct.pack("<H", w) + bmp
+    isize = 2 if len(data) < 0x10000 else 4
+    ascii = bytearray(95)
+    for i, cp in enumerate(cps):
+        if 32 <= cp <= 126:
+            ascii[cp - 32] = i + 1
+    f.write("# Code generated by font_cvt.py.\n")
+    f.write(f"# Source: {source}\n")
+    f.write("# Sparse font: chars are located by binary search.\n")
+    f.write("\n")
+    for name, v in (
+        ("height", font.height),
+        ("baseline", font.baseline),
+        ("max_width", font.max_width),
+        ("hmap", True),
+        ("reverse", font.reverse),
+        ("monospaced", font.mono),
+        ("min_ch", cps[0]),
+        ("max_ch", cps[-1]),
+    ):
+        f.write(f"def {name}():\n    return {v}\n\n")
+    pybytes(f, "_font", data)
+    pybytes(f, "_index", b"".join(struct.pack("<I" if isize == 4 else "<H", i) for i in index))
+    pybytes(f, "_cp", struct.pack(f"<{len(cps)}H", *cps))
+    pybytes(f, "_ascii", ascii)
+    if isize == 2:
+        doff = "ifb(i)"
+    else:
+        doff = "ifb(i) | (ifb(i[2:]) << 16)"
+    f.write(GET_CH.format(isize=isize, doff=doff, height=font.height))
+    return len(data) + len(index) * isize + len(cps) * 2 + len(ascii)
+
+
+def quit(msg):
+    print(msg)
+    sys.exit(1)
+
+
+DESC = """Convert a Python font created by font_to_py.py to a binary font file or
+a sparse Python font.
+Python fonts should be frozen as bytecode, otherwise their bitmaps occupy RAM.
+A binary font file is read by gui/core/fontfile.py a glyph at a time: only its
+glyph widths and a cache of recently used glyphs are held in RAM.
+If the output filename extension is ".py" a sparse Python font is written.
+This contains only the chars present in the sources, located by binary search,
+so may include scattered chars such as symbols and non-Latin alphabets.
+Glyphs may be merged from further fonts of the same height with --add; where a
+char is in more than one font the first is used.
+The output may be restricted to the chars used by an application: those in
+--chars, in the files passed with --manifest and in string literals in the
+Python sources passed with --scan. Chars created at runtime, such as the
+digits of formatted numbers, should be passed with --chars.
+Source fonts may be Python fonts or binary font files.
+The fonts must be horizontally mapped (font_to_py.py -x option).
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        __file__, description=DESC, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("infile", type=str, help="Input font")
+    parser.add_argument("outfile", type=str, help="Path and name of output file")
+    parser.add_argument("-a", "--add", action="append", default=[], help="Font to merge.")
+    parser.add_argument("-c", "--chars", type=str, help="Chars to include (default all).")
+    parser.add_argument("-m", "--manifest", action="append", default=[], help="Text file of chars to include.")
+    parser.add_argument("-s", "--scan", nargs="+", default=[], help="Include chars used by Python sources.")
+    args = parser.parse_args()
+    font = readfont(args.infile)
+    for fn in args.add:
+        font.add(readfont(fn))
+    if args.chars is not None or args.manifest or args.scan:
+        chars = set(args.chars or "")
+        for fn in args.manifest:
+            try:
+                with open(fn, encoding="utf-8") as f:
+                    chars.update(f.read())
+            except OSError:
+                quit(f"Cannot read {fn}.")
+        chars.update(scan(args.scan))
+        cps = {ord(c) for c in chars if ord(c) >= 32}  # Control chars are not rendered
+        missing = font.select(cps)
+        print(f"{len(cps)} chars required:", "".join(chr(c) for c in sorted(cps)))
+        if missing:
+            print("Warning: chars not in source font:", "".join(chr(c) for c in sorted(missing)))
+    if not font.glyphs:
+        quit("Output font would contain no chars.")
+    py = os.path.splitext(args.outfile)[1].upper() == ".PY"
+    try:
+        if py:
+            with open(args.outfile, "w") as f:
+                size = writepy(font, f, " ".join(os.path.basename(fn) for fn in [args.infile] + args.add))
+        else:
+            size = writebin(font, args.outfile)
+    except OSError:
+        quit(f"Cannot open {args.outfile} for writing.")
+    ftype = "Python" if py else "Binary"
+    print(f"{ftype} font {args.outfile} written: {len(font.glyphs)} chars, {size} bytes.")
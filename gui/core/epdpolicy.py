@@ -0,0 +1,195 @@
+# epdpolicy.py Automatic choice of full or partial refresh for ePaper displays.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Partial updates are fast but leave "ghosting" which accumulates until a full
+# refresh is done. A RefreshPolicy keeps a shadow copy of the last frame sent
+# to the display. On each refresh it compares the frame buffer with the shadow
+# and chooses between
+# NONE: Nothing has changed.
+# WINDOW: Partial update of the rectangle enclosing the changes (drivers with
+# damage tracking), otherwise
+# PARTIAL: Partial update of the whole frame.
+# FULL: If too many pixels have changed, or any area of the screen has had too
+# many partial updates, or too long has elapsed since the last full refresh.
+# Suitable for 1-bit drivers with set_partial and set_full methods.
+
+from gui.core.nanogui import render
+from array import array
+import time
+
+NONE = 0
+WINDOW = 1
+PARTIAL = 2
+FULL = 3
+
+# Compare frame buffer new with shadow old, updating old. Both are treated as
+# a grid of dims[1] rows of dims[0] bytes. Each changed byte sets the flag of its
+# cell in cells; cells are dims[2] bytes by dims[3] rows, dims[4] cells per row.
+# Returns changed bit count in dims[5] and bounding box of changed bytes as
+# columns dims[6]..dims[7]-1, rows dims[8]..dims[9]-1.
+@micropython.viper
+def _diff(new: ptr8, old: ptr8, cells: ptr8, dims: ptr32):
+    stride: int = dims[0]
+    rows: int = dims[1]
+    cw: int = dims[2]
+    ch: int = dims[3]
+    gw: int = dims[4]
+    nbits: int = 0
+    c0: int = stride
+    c1: int = 0
+    r0: int = rows
+    r1: int = 0
+    i: int = 0
+    r: int = 0
+    cy: int = 0  # Index of first cell in current row of cells
+    rk: int = 0  # Row count within cell
+    while r < rows:
+        c: int = 0
+        cx: int = cy  # Current cell
+        ck: int = 0  # Byte count within cell
+        while c < stride:
+            x: int = new[i] ^ old[i]
+            if x:
+                old[i] = new[i]
+                cells[cx] = 1
+                if c < c0:
+                    c0 = c
+                if c >= c1:
+                    c1 = c + 1
+                if r < r0:
+                    r0 = r
+                r1 = r + 1
+                while x:
+                    x &= x - 1
+                    nbits += 1
+            i += 1
+            c += 1
+            ck += 1
+            if ck == cw:
+                ck = 0
+                cx += 1
+        r += 1
+        rk += 1
+        if rk == ch:
+            rk = 0
+            cy += gw
+    dims[5] = nbits
+    dims[6] = c0
+    dims[7] = c1
+    dims[8] = r0
+    dims[9] = r1
+
+
+class RefreshPolicy:
+    # changed: percentage of pixels changed which forces a full refresh.
+    # partials: max partial updates of any area between full refreshes.
+    # period: max time (secs) between full refreshes.
+    # grid: screen is divided into grid x grid areas for counting partials.
+    def __init__(self, device, changed=30, partials=20, period=3600, grid=4):
+        if not hasattr(device, "set_partial"):
+            raise ValueError("Device does not support partial updates.")
+        self.device = device
+        self.changed = changed
+        self.partials = partials
+        self.period = period
+        self.last = NONE  # Type of the most recent refresh
+        buf = memoryview(device)
+        w = device.width
+        h = device.height
+        # Determine frame buffer layout by toggling a pixel.
+        b0 = buf[0]
+        c = device.pixel(1, 0)
+        device.pixel(1, 0, c ^ 1)
+        self._vert = buf[0] == b0  # Pixel is in byte 1: vertical mapping
+        device.pixel(1, 0, c)
+        if self._vert:
+            stride, rows = w, (h + 7) >> 3
+        else:
+            stride, rows = (w + 7) >> 3, h
+        if len(buf) != stride * rows:
+            raise ValueError("Device must be monochrome.")
+        cw = -(-stride // grid)
+        ch = -(-rows // grid)
+        gw = -(-stride // cw)
+        self._dims = array("i", (stride, rows, cw, ch, gw, 0, 0, 0, 0, 0))
+        self._cells = bytearray(gw * -(-rows // ch))  # Changed flags
+        self._counts = bytearray(len(self._cells))  # Partials since full refresh
+        self._shadow = bytearray(buf)
+        self._win = hasattr(device, "damage_mode")
+        if self._win:
+            device.damage_mode(True)
+        device.set_full()
+        self._partial = False  # Device mode
+        self._tfull = 0  # Time of last full refresh
+        self._force = True  # Display contents unknown
+
+    # Force the next refresh to be full.
+    def full(self):
+        self._force = True
+
+    # Compare frame buffer with shadow and return the type of update needed.
+    def _select(self):
+        dims = self._dims
+        cells = self._cells
+        _diff(memoryview(self.device), self._shadow, cells, dims)
+        if self._force:
+            return FULL
+        if not dims[5]:
+            return NONE
+        counts = self._counts
+        over = False
+        for n, f in enumerate(cells):
+            if f:
+                cells[n] = 0
+                counts[n] = min(counts[n] + 1, 255)
+                over |= counts[n] > self.partials
+        npix = self.device.width * self.device.height
+        if over or dims[5] * 100 >= npix * self.changed:
+            return FULL
+        if time.time() - self._tfull >= self.period:
+            return FULL
+        return WINDOW if self._win else PARTIAL
+
+    # Return (x, y, w, h) of the rectangle enclosing the changes.
+    def _region(self):
+        d = self._dims
+        if self._vert:
+            return (d[6], d[8] << 3, d[7] - d[6], (d[9] - d[8]) << 3)
+        return (d[6] << 3, d[8], (d[7] - d[6]) << 3, d[9] - d[8])
+
+    # Copy the frame buffer to the display using the chosen type of update.
+    # As with ssd.show, the display must be ready.
+    def show(self):
+        dev = self.device
+        self.last = mode = self._select()
+        if mode == NONE:
+            return
+        if mode == FULL:
+            if self._partial:
+                dev.set_full()
+                self._partial = False
+            for n in range(len(self._counts)):
+                self._counts[n] = 0
+                self._cells[n] = 0
+            self._tfull = time.time()
+            self._force = False
+        else:
+            if not self._partial:
+                dev.set_partial()
+                dev.wait_until_ready()  # Some drivers refresh on set_partial
+                self._partial = True
+            if self._win:
+                if mode == WINDOW:
+                    dev.damage(*self._region())
+                else:
+                    dev.damage(0, 0, dev.width, dev.height)
+        dev.show()
+
+    # Equivalent of nanogui refresh. A clear forces a full refresh.
+    def refresh(self, clear=False):
+        render(self.device, clear)
+        if clear:
+            self._force = True
+        self.show()
@@ -0,0 +1,138 @@
+# fontfile.py Fonts read from a file on demand.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# A Python font module holds its entire bitmap in RAM unless frozen. A font
+# file created by font_cvt.py is read a glyph at a time: only the glyph widths
+# are held in RAM, together with a bounded cache of recently used glyphs.
+# A FontFile has the same interface as a Python font so may be passed to a
+# Writer or CWriter:
+# from gui.core.fontfile import FontFile
+# wri = CWriter(ssd, FontFile("arial_50.bin"))
+
+# File format (little-endian). Header:
+# b"NF", version, flags (bit 0 reverse, bit 1 monospaced, bit 2 sparse),
+# height, max_width, baseline, min_ch, max_ch, n (no. of glyphs) all 16 bit.
+# n 16-bit glyph widths. Glyph 0 is rendered for missing chars. In a dense font
+# glyph i (i > 0) is chr(min_ch + i - 1), a width of 0 denoting a missing char.
+# A sparse font is followed by n - 1 sorted 16-bit code points of glyphs 1..n-1.
+# Glyph bitmaps in order, each comprising (width + 7) // 8 * height bytes.
+
+from array import array
+from collections import OrderedDict
+import struct
+from micropython import const
+
+_REVERSE = const(1)
+_MONO = const(2)
+_SPARSE = const(4)
+
+
+class FontFile:
+    # cache: max no. of glyphs held in RAM.
+    def __init__(self, filename, cache=16):
+        f = open(filename, "rb")
+        hdr = f.read(16)
+        if hdr[:3] != b"NF\x01":
+            f.close()
+            raise ValueError("{} is not a font file.".format(filename))
+        self._flags = hdr[3]
+        ht, self._mw, self._bl, self._mn, self._mx, n = struct.unpack("<6H", hdr[4:])
+        self._ht = ht
+        widths = array("H", bytes(2 * n))
+        f.readinto(widths)
+        o = 16 + 2 * n
+        self._cps = None
+        if self._flags & _SPARSE:
+            cps = array("H", bytes(2 * (n - 1)))
+            f.readinto(cps)
+            o += 2 * (n - 1)
+            self._cps = cps
+            # Direct map of chars 32..126 to glyph indices
+            self._ascii = bytearray(95)
+            for i, c in enumerate(cps):
+                if 32 <= c <= 126:
+                    self._ascii[c - 32] = i + 1
+        offs = array("I")  # File offset of each glyph
+        for w in widths:
+            offs.append(o)
+            o += ((w + 7) >> 3) * ht
+        self._widths = widths
+        self._offs = offs
+        self._f = f
+        self._size = cache
+        self._cache = OrderedDict()
+
+    def close(self):
+        self._f.close()
+
+    def height(self):
+        return self._ht
+
+    def baseline(self):
+        return self._bl
+
+    def max_width(self):
+        return self._mw
+
+    def hmap(self):
+        return True
+
+    def reverse(self):
+        return bool(self._flags & _REVERSE)
+
+    def monospaced(self):
+        return bool(self._flags & _MONO)
+
+    def min_ch(self):
+        return self._mn
+
+    def max_ch(self):
+        return self._mx
+
+    # Return glyph index of a char.
+    def _idx(self, ch):
+        oc = ord(ch)
+        cps = self._cps
+        if cps is None:
+            i = oc - self._mn + 1
+            return i if 0 < i < len(self._widths) and self._widths[i] else 0
+        if 32 <= oc <= 126:
+            return self._ascii[oc - 32]
+        lo = 0
+        hi = len(cps)
+        while lo < hi:  # Binary search of code points
+            mid = (lo + hi) >> 1
+            c = cps[mid]
+            if c < oc:
+                lo = mid + 1
+            elif c > oc:
+                hi = mid
+            else:
+                return mid + 1
+        return 0
+
+    # Width of a glyph: no file access is needed.
+    def width(self, ch):
+        return self._widths[self._idx(ch)]
+
+    # The glyph is returned as a bytearray which the caller may retain: on a
+    # cache miss a new one is allocated.
+    def get_ch(self, ch):
+        i = self._idx(ch)
+        width = self._widths[i]
+        cache = self._cache
+        glyph = cache.get(i)
+        if glyph is None:
+            glyph = bytearray(((width + 7) >> 3) * self._ht)
+            self._f.seek(self._offs[i])
+            self._f.readinto(glyph)
+            if self._size:
+                if len(cache) >= self._size:
+                    del cache[next(iter(cache))]  # Discard least recently used
+                cache[i] = glyph
+        else:
+            del cache[i]  # Move to most recently used position
+            cache[i] = glyph
+        return glyph, self._ht, width
@@ -23,7 +23,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from gui.core.nanogui import DObject, circle
+from gui.core.nanogui import DObject, circle, damage
 from cmath import rect, pi
 from micropython import const
 from array import array
@@ -234,6 +234,7 @@ class CartesianGraph(Graph):
         ys = round(self.yp_origin - start[1] * self.y_axis_len)
         xe = round(self.xp_origin + end[0] * self.x_axis_len)
         ye = round(self.yp_origin - end[1] * self.y_axis_len)
+        damage(self.device, min(xs, xe), min(ys, ye), abs(xe - xs) + 1, abs(ye - ys) + 1)
         self.device.line(xs, ys, xe, ye, color)
 
 class PolarGraph(Graph):
@@ -274,4 +275,5 @@ class PolarGraph(Graph):
         ys = round(self.yp_origin - start.imag * height)
         xe = round(self.xp_origin + end.real * height)
         ye = round(self.yp_origin - end.imag * height)
+        damage(self.device, min(xs, xe), min(ys, ye), abs(xe - xs) + 1, abs(ye - ys) + 1)
         self.device.line(xs, ys, xe, ye, color)
@@ -0,0 +1,285 @@
+# image.py Display images created by img_cvt.py
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Compressed images (img_cvt.py --packbits) are decoded a row at a time
+# directly into the destination buffer. Only one compressed row is buffered.
+# load and aload place any image at any position on a display, clipping it and
+# converting it to the display's mode. Files are read in chunks of up to
+# _CHUNK bytes; aload yields to the scheduler after each chunk.
+
+import asyncio
+from array import array
+from framebuf import RGB565, GS4_HMSB, GS8
+from micropython import const
+
+_CHUNK = const(2048)
+
+# Decode n bytes of PackBits data from src to dest. size is bytes per pixel.
+@micropython.viper
+def _unpack(dest: ptr8, src: ptr8, n: int, size: int):
+    s: int = 0
+    d: int = 0
+    while s < n:
+        h: int = src[s]
+        s += 1
+        if h < 128:  # Literal pixels
+            k: int = (h + 1) * size
+            while k:
+                dest[d] = src[s]
+                d += 1
+                s += 1
+                k -= 1
+        elif h > 128:  # Repeated pixel
+            k = 257 - h
+            while k:
+                j: int = 0
+                while j < size:
+                    dest[d] = src[s + j]
+                    d += 1
+                    j += 1
+                k -= 1
+            s += size
+
+
+# Copy n pixels from src to dest converting between modes. args: n, source
+# mode, dest mode, index of first source pixel, index of first dest pixel.
+# GS4_HMSB is greyscale; other modes are color.
+@micropython.viper
+def _cvt(dest: ptr8, src: ptr8, args: ptr32):
+    n: int = args[0]
+    sm: int = args[1]
+    dm: int = args[2]
+    sp: int = args[3]
+    dp: int = args[4]
+    while n:
+        if sm == 1:  # RGB565: expand to 8 bits per color
+            v: int = (src[sp << 1] << 8) | src[(sp << 1) + 1]
+            r: int = v >> 11
+            r = (r << 3) | (r >> 2)
+            g: int = (v >> 5) & 0x3F
+            g = (g << 2) | (g >> 4)
+            b: int = v & 0x1F
+            b = (b << 3) | (b >> 2)
+        elif sm == 6:  # GS8 (RRRGGGBB)
+            v = src[sp]
+            r = v >> 5
+            r = (r << 5) | (r << 2) | (r >> 1)
+            g = (v >> 2) & 7
+            g = (g << 5) | (g << 2) | (g >> 1)
+            b = (v & 3) * 0x55
+        else:  # GS4_HMSB
+            v = src[sp >> 1]
+            v = (v & 0x0F) if sp & 1 else (v >> 4)
+            r = v * 17
+            g = r
+            b = r
+        if dm == 1:
+            v = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+            dest[dp << 1] = v >> 8
+            dest[(dp << 1) + 1] = v
+        elif dm == 6:
+            dest[dp] = (r & 0xE0) | ((g >> 3) & 0x1C) | (b >> 6)
+        else:
+            v = (r * 77 + g * 150 + b * 29) >> 12  # 4-bit luminance
+            i: int = dp >> 1
+            if dp & 1:
+                dest[i] = (dest[i] & 0xF0) | v
+            else:
+                dest[i] = (dest[i] & 0x0F) | (v << 4)
+        sp += 1
+        dp += 1
+        n -= 1
+
+
+def rowbytes(cols, mode):
+    return cols * 2 if mode == RGB565 else cols if mode == GS8 else (cols + 1) // 2
+
+
+# Decode a compressed image into buf, which may be a display's .mvb or the buffer
+# of a FrameBuffer for blitting. src is a filename, a file opened in binary mode
+# or an imported Python image. stride is the no. of bytes between rows of buf
+# (default: image width) and offset is the index of the first byte written. For
+# GS4_HMSB images offset must correspond to an even column. Returns (rows, cols).
+def unpack(src, buf, stride=0, offset=0):
+    if isinstance(src, str):
+        with open(src, "rb") as f:
+            return unpack(f, buf, stride, offset)
+    if hasattr(src, "data"):  # Python image
+        if not getattr(src, "packed", False):
+            raise ValueError("Image is not compressed.")
+        rows, cols, mode = src.rows, src.cols, src.mode
+        data = memoryview(src.data)
+        f = None
+    else:
+        f = src
+        hdr = f.read(8)
+        if hdr[:2] != b"PB":
+            raise ValueError("Image is not compressed.")
+        mode = hdr[2]
+        rows = int.from_bytes(hdr[4:6], "big")
+        cols = int.from_bytes(hdr[6:8], "big")
+        rbuf = bytearray(0)
+    size = 2 if mode == RGB565 else 1
+    nbytes = rowbytes(cols, mode)
+    stride = stride or nbytes
+    mvb = memoryview(buf)
+    if offset + (rows - 1) * stride + nbytes > len(mvb):
+        raise ValueError("Image does not fit buffer.")
+    s = 0  # Index into data
+    for d in range(offset, offset + rows * stride, stride):
+        if f is None:
+            n = (data[s] << 8) | data[s + 1]
+            s += 2
+            row = data[s : s + n]
+            s += n
+        else:
+            n = int.from_bytes(f.read(2), "big")
+            if n > len(rbuf):
+                rbuf = bytearray(n)
+            row = memoryview(rbuf)[:n]
+            f.readinto(row)
+        _unpack(mvb[d:], row, n, size)
+    return rows, cols
+
+
+# Generator: copy an image into a display's frame buffer a chunk at a time,
+# yielding after each chunk.
+def _load(ssd, src, row, col, mode):
+    f = None
+    if isinstance(src, str):
+        f = open(src, "rb")
+    try:
+        return (yield from _place(ssd, src if f is None else f, row, col, mode))
+    finally:
+        if f is not None:
+            f.close()
+
+
+def _place(ssd, src, row, col, mode):
+    packed = False
+    data = None
+    if hasattr(src, "data"):  # Python image
+        rows, cols, mode = src.rows, src.cols, src.mode
+        packed = getattr(src, "packed", False)
+        data = memoryview(src.data)
+    else:
+        hdr = src.read(4)
+        if hdr[:2] == b"PB":
+            packed = True
+            mode = hdr[2]
+            hdr = src.read(4)
+        rows = int.from_bytes(hdr[:2], "big")
+        cols = int.from_bytes(hdr[2:], "big")
+        if mode is None:  # Deduce mode of a raw file from its size
+            nbytes = src.seek(0, 2) - 4
+            src.seek(4)
+            mode = RGB565 if nbytes == rows * cols * 2 else GS8 if nbytes == rows * cols else GS4_HMSB
+    nbytes = rowbytes(cols, mode)  # Source row length
+    dmode = ssd.mode
+    # Clip
+    srow = max(0, -row)
+    scol = max(0, -col)
+    drow = max(0, row)
+    dcol = max(0, col)
+    nrows = min(rows - srow, ssd.height - drow)
+    ncols = min(cols - scol, ssd.width - dcol)
+    if nrows <= 0 or ncols <= 0:
+        return rows, cols
+    if hasattr(ssd, "damage"):
+        ssd.damage(dcol, drow, ncols, nrows)
+    mvb = ssd.mvb
+    stride = rowbytes(ssd.width, dmode)
+    # Same mode and byte aligned: copy bytes, otherwise convert each pixel.
+    copy = mode == dmode
+    if mode == GS4_HMSB:
+        copy = copy and not ((scol | dcol | ncols) & 1)
+    if copy:
+        scol, dcol, ncopy = rowbytes(scol, mode), rowbytes(dcol, mode), rowbytes(ncols, mode)
+    else:
+        args = array("i", (ncols, mode, dmode, scol, dcol))
+    d = drow * stride  # Start of destination row
+    if packed:
+        size = 2 if mode == RGB565 else 1
+        rbuf = bytearray(nbytes)  # Decoded row
+        cbuf = bytearray(0)  # Compressed row
+        s = 0
+        nread = 0
+        for r in range(srow + nrows):
+            if data is None:
+                n = int.from_bytes(src.read(2), "big")
+                if r < srow:
+                    src.seek(n, 1)
+                    continue
+                if n > len(cbuf):
+                    cbuf = bytearray(n)
+                crow = memoryview(cbuf)[:n]
+                src.readinto(crow)
+                nread += n
+            else:
+                n = (data[s] << 8) | data[s + 1]
+                s += n + 2
+                if r < srow:
+                    continue
+                crow = data[s - n : s]
+            _unpack(rbuf, crow, n, size)
+            if copy:
+                mvb[d + dcol : d + dcol + ncopy] = rbuf[scol : scol + ncopy]
+            else:
+                _cvt(mvb[d:], rbuf, args)
+            d += stride
+            if nread >= _CHUNK:
+                nread = 0
+                yield
+        return rows, cols
+    nchunk = max(1, _CHUNK // nbytes)  # Rows per chunk
+    if data is None:  # Raw file: read as many rows as fit in a chunk
+        src.seek(4 + srow * nbytes)
+        buf = memoryview(bytearray(nchunk * nbytes))
+    else:
+        s = srow * nbytes
+        chunk = data
+    while nrows:
+        n = min(nrows, nchunk)
+        if data is None:
+            chunk = buf[: n * nbytes]
+            src.readinto(chunk)
+            s = 0
+        for _ in range(n):
+            if copy:
+                mvb[d + dcol : d + dcol + ncopy] = chunk[s + scol : s + scol + ncopy]
+            else:
+                _cvt(mvb[d:], chunk[s:], args)
+            s += nbytes
+            d += stride
+        nrows -= n
+        if nrows:
+            yield
+    return rows, cols
+
+
+# Copy an image to a display's frame buffer with its top left corner at (row,
+# col), clipping to the screen. src is a filename, a file opened in binary
+# mode or an imported Python image, compressed or not. The image is converted
+# to the display's mode if necessary: a 4-bit display should be in greyscale
+# mode. mode may be passed for a raw binary file, otherwise it is deduced from
+# the file size. Returns the image (rows, cols).
+def load(ssd, src, row=0, col=0, mode=None):
+    g = _load(ssd, src, row, col, mode)
+    try:
+        while True:
+            next(g)
+    except StopIteration as e:
+        return e.value
+
+
+# As load but yields to the scheduler after each chunk.
+async def aload(ssd, src, row=0, col=0, mode=None):
+    g = _load(ssd, src, row, col, mode)
+    try:
+        while True:
+            next(g)
+            await asyncio.sleep_ms(0)
+    except StopIteration as e:
+        return e.value
@@ -30,29 +30,68 @@ def fillcircle(dev, x0, y0, r, color): # Draw filled circle
     x, y, r = int(x0), int(y0), int(r)
     dev.ellipse(x, y, r, r, color, True)
     
+# Inform a driver which supports damage tracking that a region has changed.
+def damage(dev, x, y, w, h):
+    if hasattr(dev, "damage"):
+        dev.damage(x, y, w, h)
+
 # If a (framebuf based) device is passed to refresh, the screen is cleared.
 # None causes pending widgets to be drawn and the result to be copied to hardware.
 # The pend mechanism enables a displayable object to postpone its renedering
 # until it is complete: efficient for e.g. Dial which may have multiple Pointers
+# Drivers with a damage method are told which areas have changed: in damage mode
+# such a driver only outputs the changed region.
+# In schedule mode every widget uses the pend mechanism: each pending widget is
+# drawn once per refresh however many times its value changed.
 def refresh(device, clear=False):
+    render(device, clear)
+    device.show()
+
+# Update the frame buffer as per refresh without copying it to hardware. For use
+# where something else (e.g. an EPD refresh policy) decides how to update it.
+# Returns the rectangle (x, y, w, h) enclosing the widgets drawn, or None.
+def render(device, clear=False):
     if not isinstance(device, framebuf.FrameBuffer):
         raise ValueError('Device must be derived from FrameBuffer.')
     if device not in DObject.devices:
         DObject.devices[device] = set()
+        DObject.clears += 1
         device.fill(0)
+        damage(device, 0, 0, device.width, device.height)
     else:
         if clear:
             DObject.devices[device].clear()  # Clear the pending set
+            DObject.clears += 1
             device.fill(0)
+            damage(device, 0, 0, device.width, device.height)
         else:
-            for obj in DObject.devices[device]:
+            pend = DObject.devices[device]
+            if not pend:
+                return None
+            x0 = y0 = 0xFFFF
+            x1 = y1 = -0xFFFF
+            for obj in pend:
                 obj.show()
-            DObject.devices[device].clear()
-    device.show()
+                x0 = min(x0, obj.col - 2)  # Allow for border
+                y0 = min(y0, obj.row - 2)
+                x1 = max(x1, obj.col + obj.width + 2)
+                y1 = max(y1, obj.row + obj.height + 2)
+            pend.clear()
+            return (x0, y0, x1 - x0, y1 - y0)
+    return (0, 0, device.width, device.height)
+
+# Schedule mode: widgets are drawn by refresh rather than when their value
+# changes. Call with no arg to read the current mode.
+def schedule(v=None):
+    if v is not None:
+        DObject.scheduled = bool(v)
+    return DObject.scheduled
 
 # Displayable object: effectively an ABC for all GUI objects.
 class DObject():
     devices = {}  # Index device instance, value is a set of pending objects
+    scheduled = False  # Schedule mode
+    clears = 0  # Incremented when a display is cleared: widgets must be redrawn
 
     @classmethod
     def _set_pend(cls, obj):
@@ -98,6 +137,7 @@ class DObject():
         self.def_bdcolor = bdcolor
         # has_border is True if a border was drawn
         self.has_border = False
+        self._state = None  # Appearance when last drawn
 
     def warning(self):
         print('Warning: attempt to create {} outside screen dimensions.'.format(self.__class__.__name__))
@@ -107,6 +147,7 @@ class DObject():
     def show(self):
         wri = self.writer
         dev = self.device
+        damage(dev, self.col - 2, self.row - 2, self.width + 4, self.height + 4)
         dev.fill_rect(self.col, self.row, self.width, self.height, self.bgcolor)
         if isinstance(self.bdcolor, bool):  # No border
             if self.has_border:  # Border exists: erase it
@@ -116,6 +157,24 @@ class DObject():
             dev.rect(self.col - 2, self.row - 2, self.width + 4, self.height + 4, self.bdcolor)
             self.has_border = True
 
+    # Redraw now or, in schedule mode, at the next refresh of the device.
+    def _redraw(self):
+        pend = DObject.devices.get(self.device)
+        if DObject.scheduled and pend is not None:
+            pend.add(self)
+        else:
+            self.show()
+
+    # Value change suppression. args characterise the widget's appearance, e.g.
+    # the pixel position of a pointer. Return False if they match those at the
+    # last call and the display has not since been cleared.
+    def _changed(self, *args):
+        args += (DObject.clears,)
+        if args == self._state:
+            return False
+        self._state = args
+        return True
+
     def value(self, v=None):
         if v is not None:
             self._value = v
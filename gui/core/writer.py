@@ -1,6 +1,12 @@
 # writer.py Implements the Writer class.
 # Handles colour, word wrap and tab stops
 
+# V0.5.8 Oct 2026 Glyph FrameBuffers have width and height attributes.
+# V0.5.7 Oct 2026 Support fonts read from a file (FontFile).
+# V0.5.6 Oct 2026 Per-font width tables for string measurement.
+# V0.5.5 Oct 2026 Single pass word wrap.
+# V0.5.4 Oct 2026 CWriter fast path for single line strings.
+# V0.5.3 Oct 2026 Optional LRU cache of glyph FrameBuffers.
 # V0.5.2 May 2025 Fix bug whereby glyph clipping might be attempted.
 # V0.5.1 Dec 2022 Support 4-bit color display drivers.
 # V0.5.0 Sep 2021 Color now requires firmware >= 1.17.
@@ -24,8 +30,19 @@
 
 import framebuf
 from uctypes import bytearray_at, addressof
+from collections import OrderedDict
+from array import array
 
-__version__ = (0, 5, 2)
+__version__ = (0, 5, 8)
+
+
+# A FrameBuffer which knows its size. Drivers which track changed areas (e.g.
+# SSD1306) read the width and height of a blitted FrameBuffer.
+class Glyph(framebuf.FrameBuffer):
+    def __init__(self, buf, width, height, mode):
+        super().__init__(buf, width, height, mode)
+        self.width = width
+        self.height = height
 
 
 class DisplayState:
@@ -44,6 +61,20 @@ def _get_id(device):
 class Writer:
 
     state = {}  # Holds a display state for each device
+    _cache_size = 0  # Max no. of glyphs cached per font. 0 disables caching.
+    _cache = {}  # Index font, value OrderedDict of cached glyphs
+    _metrics = {}  # Index font, value (advance widths, ink widths, min_ch - 1) or False
+    _MAX_METRICS = 256  # Fonts with a larger char range are measured per char
+    _inks = {}  # Index font, value dict of ink widths of fonts without tables
+
+    # Set or return the glyph cache size. Changing it empties the cache.
+    @staticmethod
+    def cache_size(size=None):
+        if size is not None:
+            Writer._cache_size = size
+            for cache in Writer._cache.values():
+                cache.clear()
+        return Writer._cache_size
 
     @staticmethod
     def set_textpos(device, row=None, col=None):
@@ -67,6 +98,10 @@ class Writer:
         if self.devid not in Writer.state:
             Writer.state[self.devid] = DisplayState()
         self.font = font
+        if font not in Writer._cache:
+            Writer._cache[font] = OrderedDict()
+        self._gcache = Writer._cache[font]
+        self._metric = None  # Width tables: built on first measurement. False: none
         if font.height() >= device.height or font.max_width() >= device.width:
             raise ValueError("Font too large for screen")
         # Allow to work with reverse or normal font mapping
@@ -92,9 +127,11 @@ class Writer:
         self.cpos = 0
         self.tab = 4
 
-        self.glyph = None  # Current char
+        self.glyph = None  # FrameBuffer holding current char
         self.char_height = 0
         self.char_width = 0
+        # Drivers supporting damage tracking are told which region has changed
+        self._damage = getattr(device, "damage", None)
 
     def _getstate(self):
         return Writer.state[self.devid]
@@ -111,6 +148,8 @@ class Writer:
                 self.device.scroll(0, margin)
                 self.device.fill_rect(0, y, self.screenwidth, abs(margin), self.bgcolor)
                 s.text_row += margin
+                if self._damage is not None:  # Whole screen has moved
+                    self._damage(0, 0, self.screenwidth, self.screenheight)
 
     def set_clip(self, row_clip=None, col_clip=None, wrap=None):
         if row_clip is not None:
@@ -126,6 +165,9 @@ class Writer:
         return self.font.height()
 
     def printstring(self, string, invert=False):
+        st = self._getstate()
+        row = st.text_row
+        col = st.text_col
         # word wrapping. Assumes words separated by single space.
         q = string.split("\n")
         last = len(q) - 1
@@ -134,24 +176,87 @@ class Writer:
                 self._printline(s, invert)
             if n != last:
                 self._printchar("\n")
+        if self._damage is not None:  # Record the area covered by the text
+            if st.text_row == row:
+                self._damage(col, row, st.text_col - col, self.height)
+            else:  # Text has wrapped: record full width of rows
+                row = min(row, st.text_row)
+                self._damage(0, row, self.screenwidth, abs(st.text_row - row) + self.height)
 
     def _printline(self, string, invert):
-        rstr = None
-        if self.wrap and self.stringlen(string, True):  # Length > self.screenwidth
-            pos = 0
-            lstr = string[:]
-            while self.stringlen(lstr, True):  # Length > self.screenwidth
-                pos = lstr.rfind(" ")
-                lstr = lstr[:pos].rstrip()
-            if pos > 0:
-                rstr = string[pos + 1 :]
-                string = lstr
-
-        for char in string:
-            self._printchar(char, invert)
-        if rstr is not None:
-            self._printchar("\n")
-            self._printline(rstr, invert)  # Recurse
+        if not self.wrap:
+            for char in string:
+                self._printchar(char, invert)
+            return
+        newline = False
+        for start, end in self.linebreaks(string, self.screenwidth, self._getstate().text_col):
+            if newline:
+                self._printchar("\n")
+            newline = True
+            for char in string[start:end]:
+                self._printchar(char, invert)
+
+    # Word wrap in a single pass: each glyph is measured once. Yields (start, end)
+    # for each line of string, where width is the line length in pixels and col
+    # is the starting column of the first line. Lines break at spaces, which are
+    # discarded. A word too long for a line is split if split is True, otherwise
+    # the rest of the string is yielded (overhanging glyphs are discarded). In
+    # that case lines break as in earlier versions: a first word which overflows
+    # after two or more leading spaces starts a new line, as does overflow by
+    # trailing spaces.
+    def linebreaks(self, string, width, col=0, split=False):
+        advance = self._advance
+        n = len(string)
+        ls = 0  # Start of current line
+        brk = -1  # End of last word on current line which fits
+        ws = 0  # Start of current word
+        xws = col  # Column of start of current word
+        x = col  # Column of current glyph
+        i = 0
+        while i < n:
+            c = string[i]
+            w = advance(c)
+            if c == " ":
+                x += w
+                i += 1
+                continue
+            if i == ls or string[i - 1] == " ":  # Start of a word
+                ws = i
+                xws = x
+            eow = i + 1 == n or string[i + 1] == " "  # End of word
+            # Last glyph of a word may have blank columns on RHS
+            if x + w > width and not (eow and x + self._truelen(c) <= width):
+                if brk > ls:  # Wrap at end of last word which fitted
+                    yield ls, brk
+                    ls = ws
+                    x -= xws  # Re-measure current glyph at new position
+                    xws = 0
+                    brk = -1
+                    continue
+                if not split:
+                    if ws - ls > 1:  # Wrap after leading spaces
+                        yield ls, ls
+                        ls = ws
+                        x -= xws
+                        xws = 0
+                        continue
+                    break
+                if i > ls:  # Split word at the edge
+                    yield ls, i
+                    ls = ws = i
+                    x = xws = 0
+                    continue
+            x += w
+            if eow:
+                brk = i + 1
+            i += 1
+        if not split and i == n and n > ls and string[-1] == " ":
+            if x - advance(" ") + self._truelen(" ") > width:  # Spaces overflow
+                yield ls, max(brk, ls)
+                ls = n
+                yield ls, n
+        if ls < n:
+            yield ls, n
 
     def stringlen(self, string, oh=False):
         if not len(string):
@@ -159,21 +264,93 @@ class Writer:
         sc = self._getstate().text_col  # Start column
         wd = self.screenwidth
         l = 0
-        for char in string[:-1]:
-            _, _, char_width = self.font.get_ch(char)
-            l += char_width
-            if oh and l + sc > wd:
-                return True  # All done. Save time.
+        m = self._mtable()
+        if not m:
+            advance = self._advance
+            for char in string[:-1]:
+                l += advance(char)
+                if oh and l + sc > wd:
+                    return True  # All done. Save time.
+        else:
+            adv, _, mc = m
+            n = len(adv)
+            for char in string[:-1]:
+                o = ord(char) - mc
+                l += adv[o if 0 < o < n else 0]
+                if oh and l + sc > wd:
+                    return True
         char = string[-1]
-        _, _, char_width = self.font.get_ch(char)
+        char_width = self._advance(char)
         if oh and l + sc + char_width > wd:
             l += self._truelen(char)  # Last char might have blank cols on RHS
         else:
             l += char_width  # Public method. Return same value as old code.
         return l + sc > wd if oh else l
 
+    # Per-font width tables are shared by all Writers using the font. Entries
+    # are indexed by ord(char) - min_ch + 1, with entry 0 holding the default
+    # glyph rendered for out of range chars. Advance widths are read from the
+    # font once; ink widths (excluding blank columns on RHS) as each is needed.
+    # Returns False if the font's range is too large for tables.
+    def _mtable(self):
+        m = self._metric
+        if m is None:
+            font = self.font
+            m = Writer._metrics.get(font)
+            if m is None:
+                # Early fonts have no min_ch, max_ch and cover 32..126
+                mn = font.min_ch() if hasattr(font, "min_ch") else 32
+                mx = font.max_ch() if hasattr(font, "max_ch") else 126
+                if mx - mn >= Writer._MAX_METRICS:
+                    m = False  # Too large a range: tables would waste RAM
+                else:
+                    # A FontFile provides widths without reading glyphs
+                    width = getattr(font, "width", lambda ch: font.get_ch(ch)[2])
+                    adv = array("H", [width(chr(mx + 1))])  # Default glyph
+                    for c in range(mn, mx + 1):
+                        adv.append(width(chr(c)))
+                    ink = array("H", [0xFFFF] * len(adv))  # 0xFFFF: not yet known
+                    m = (adv, ink, mn - 1)
+                Writer._metrics[font] = m
+            self._metric = m
+        return m
+
+    # Return the advance width of a glyph
+    def _advance(self, char):
+        m = self._mtable()
+        if not m:
+            font = self.font
+            return font.width(char) if hasattr(font, "width") else font.get_ch(char)[2]
+        adv, _, mc = m
+        o = ord(char) - mc
+        return adv[o if 0 < o < len(adv) else 0]
+
     # Return the printable width of a glyph less any blank columns on RHS
     def _truelen(self, char):
+        m = self._mtable()
+        if not m:
+            font = self.font
+            ink = Writer._inks.get(font)
+            if ink is None or len(ink) >= Writer._MAX_METRICS:  # Limit RAM use
+                ink = {}
+                Writer._inks[font] = ink
+            w = ink.get(char)
+            if w is None:
+                w = self._inkwidth(char)
+                ink[char] = w
+            return w
+        _, ink, mc = m
+        o = ord(char) - mc
+        if not 0 < o < len(ink):
+            o = 0
+        w = ink[o]
+        if w == 0xFFFF:
+            w = self._inkwidth(char)
+            ink[o] = w
+        return w
+
+    # Scan a glyph bitmap for its rightmost lit column
+    def _inkwidth(self, char):
         glyph, ht, wd = self.font.get_ch(char)
         div, mod = divmod(wd, 8)
         gbytes = div + 1 if mod else div  # No. of bytes per row of glyph
@@ -194,7 +371,35 @@ class Writer:
         # print('Truelen', char, wd, mc + 1)  # TEST
         return mc + 1
 
-    def _get_char(self, char, recurse):
+    # Return a FrameBuffer for a glyph with its dimensions. If caching is
+    # enabled the least recently used glyph is discarded when the cache is full.
+    def _fbuf(self, char, invert):
+        size = Writer._cache_size
+        if size:
+            cache = self._gcache
+            key = ord(char) << 1 | invert
+            entry = cache.get(key)
+            if entry is not None:
+                del cache[key]  # Move to most recently used position
+                cache[key] = entry
+                return entry
+        glyph, char_height, char_width = self.font.get_ch(char)
+        entry = (self._mkfbuf(glyph, char_height, char_width, invert), char_height, char_width)
+        if size:
+            if len(cache) >= size:
+                del cache[next(iter(cache))]
+            cache[key] = entry
+        return entry
+
+    # Invert is for black-on-white rendering.
+    def _mkfbuf(self, glyph, char_height, char_width, invert):
+        buf = bytearray(glyph)
+        if invert:
+            for i, v in enumerate(buf):
+                buf[i] = 0xFF & ~v
+        return Glyph(buf, char_width, char_height, self.map)
+
+    def _get_char(self, char, recurse, invert=False):
         if not recurse:  # Handle tabs
             if char == "\n":
                 self.cpos = 0
@@ -212,7 +417,7 @@ class Writer:
         if char == "\n":
             self._newline()
             return
-        glyph, char_height, char_width = self.font.get_ch(char)
+        fbc, char_height, char_width = self._fbuf(char, invert)
         s = self._getstate()
         if s.text_row + char_height > self.screenheight:
             if self.row_clip:
@@ -223,23 +428,18 @@ class Writer:
                 return  # Can't clip a glyph: discard
             else:
                 self._newline()
-        self.glyph = glyph
+        self.glyph = fbc
         self.char_height = char_height
         self.char_width = char_width
 
     # Method using blitting. Efficient rendering for monochrome displays.
-    # Tested on SSD1306. Invert is for black-on-white rendering.
+    # Tested on SSD1306.
     def _printchar(self, char, invert=False, recurse=False):
         s = self._getstate()
-        self._get_char(char, recurse)
+        self._get_char(char, recurse, invert)
         if self.glyph is None:
             return  # All done
-        buf = bytearray(self.glyph)
-        if invert:
-            for i, v in enumerate(buf):
-                buf[i] = 0xFF & ~v
-        fbc = framebuf.FrameBuffer(buf, self.char_width, self.char_height, self.map)
-        self.device.blit(fbc, s.text_col, s.text_row)
+        self.device.blit(self.glyph, s.text_col, s.text_row)
         s.text_col += self.char_width
         self.cpos += 1
 
@@ -278,17 +478,52 @@ class CWriter(Writer):
         self.def_bgcolor = self.bgcolor
         self.def_fgcolor = self.fgcolor
 
+    # Fast path for the common case of a string which fits on the current line
+    # and contains no newlines or tabs. The palette is set once and glyphs are
+    # blitted in a tight loop. Other strings are handled by the general case.
+    def printstring(self, string, invert=False):
+        s = self._getstate()
+        row = s.text_row
+        col = s.text_col
+        if (
+            "\n" in string
+            or "\t" in string
+            or row + self.font.height() > self.screenheight
+            or col + self.stringlen(string) > self.screenwidth
+        ):
+            super().printstring(string, invert)
+            return
+        dev = self.device
+        blit = dev.blit
+        fbuf = self._fbuf
+        palette = dev.palette
+        palette.bg(self.fgcolor if invert else self.bgcolor)
+        palette.fg(self.bgcolor if invert else self.fgcolor)
+        for char in string:
+            fbc, _, char_width = fbuf(char, False)
+            blit(fbc, col, row, -1, palette)
+            col += char_width
+        self.cpos += len(string)
+        if self._damage is not None:
+            self._damage(s.text_col, row, col - s.text_col, self.height)
+        s.text_col = col
+
+    # The glyph is not copied: inversion is performed by the palette. A glyph
+    # passed as a bytearray (e.g. by FontFile) is referenced by the FrameBuffer
+    # which keeps it alive.
+    def _mkfbuf(self, glyph, char_height, char_width, invert):
+        buf = glyph if isinstance(glyph, bytearray) else bytearray_at(addressof(glyph), len(glyph))
+        return Glyph(buf, char_width, char_height, self.map)
+
     def _printchar(self, char, invert=False, recurse=False):
         s = self._getstate()
-        self._get_char(char, recurse)
+        self._get_char(char, recurse)  # Cached glyphs are independent of invert
         if self.glyph is None:
             return  # All done
-        buf = bytearray_at(addressof(self.glyph), len(self.glyph))
-        fbc = framebuf.FrameBuffer(buf, self.char_width, self.char_height, self.map)
         palette = self.device.palette
         palette.bg(self.fgcolor if invert else self.bgcolor)
         palette.fg(self.bgcolor if invert else self.fgcolor)
-        self.device.blit(fbc, s.text_col, s.text_row, -1, palette)
+        self.device.blit(self.glyph, s.text_col, s.text_row, -1, palette)
         s.text_col += self.char_width
         self.cpos += 1
 
@@ -0,0 +1,55 @@
+# refresh_bench.py Report frame times of 4-bit color drivers.
+# Compares ping-pong mode off and on where supported (ILI9341, ST7789, GC9A01).
+# The driver's lines_per_write constructor arg is set in color_setup.py.
+
+# Released under the MIT License (MIT). See LICENSE.
+# Copyright (c) 2026 Peter Hinch
+
+# Initialise hardware and framebuf before importing modules
+from color_setup import ssd  # Create a display instance
+
+import asyncio
+import gc
+from time import ticks_us, ticks_diff
+from gui.core.nanogui import refresh
+from gui.core.colors import *
+
+N = 10  # Frames per measurement
+
+
+def sync_time():
+    t = ticks_us()
+    for _ in range(N):
+        ssd.show()
+    return ticks_diff(ticks_us(), t) // (N * 1000)
+
+
+async def async_time():
+    t = ticks_us()
+    for _ in range(N):
+        await ssd.do_refresh()
+    return ticks_diff(ticks_us(), t) // (N * 1000)
+
+
+def test():
+    refresh(ssd, True)
+    for n in range(16):  # Something to look at
+        ssd.fill_rect(n * ssd.width // 16, 0, ssd.width // 16, ssd.height, n)
+    pp = hasattr(ssd, "ping_pong")
+    for v in (False, True) if pp else (False,):
+        if pp:
+            ssd.ping_pong(v)
+            dma = "DMA" if ssd._dma is not None else "no DMA"
+            print("Ping-pong {}".format("on ({})".format(dma) if v else "off"))
+        gc.collect()
+        lb = getattr(ssd, "_linebuf", getattr(ssd, "linebuf", b""))
+        print("  Line buffer {} bytes".format(len(lb)))
+        if hasattr(ssd, "do_refresh"):
+            t = asyncio.run(async_time())
+            print("  show {}ms do_refresh {}ms".format(sync_time(), t))
+        else:
+            print("  show {}ms".format(sync_time()))
+    if pp:
+        ssd.ping_pong(False)
+
+test()
@@ -4,7 +4,9 @@
 # Copyright (c) 2018-2020 Peter Hinch
 
 import cmath
+from framebuf import MONO_HLSB
 from gui.core.nanogui import DObject, circle, fillcircle
+from gui.core.writer import Glyph
 from gui.widgets.label import Label
 
 # Line defined by polar coords; origin and line are complex
@@ -40,6 +42,7 @@ class Pointer():
         self.dial = dial
         self.val = 0 + 0j
         self.color = None
+        self._state = None  # Pixel position and color when last drawn
 
     def value(self, v=None, color=None):
         self.color = color
@@ -52,6 +55,12 @@ class Pointer():
                     self.val = v
             else:
                 raise ValueError('Pointer value must be complex.')
+        # Skip the redraw if the tip would land on the same pixel.
+        r = self.dial.radius
+        state = (round(self.val.real * r), round(self.val.imag * r), color, DObject.clears)
+        if state == self._state:
+            return self.val
+        self._state = state
         self.dial.vectors.add(self)
         self.dial._set_pend(self.dial)  # avoid redrawing for each vector
         return self.val
@@ -73,29 +82,51 @@ class Dial(DObject):
         self.xorigin = col + radius
         self.yorigin = row + radius
         self.vectors = set()
+        # vectors (complex)
+        vor = self.xorigin + 1j * self.yorigin
+        vtstart = 0.9 * radius + 0j  # start of tick
+        vtick = 0.1 * radius + 0j  # tick
+        vrot = cmath.exp(2j * cmath.pi/ticks)  # unit rotation
+        self._ticks = []  # Integer tick endpoints
+        for _ in range(ticks):
+            vs = vor + conj(vtstart)
+            xs, ys = vs.real, vs.imag
+            self._ticks.append((round(xs), round(ys), round(xs + vtick.real), round(ys - vtick.imag)))
+            vtick *= vrot
+            vtstart *= vrot
+        self._sprite = None  # Face rendered to a 1-bit FrameBuffer
+
+    # Draw ticks and circle with the widget's top left corner at col, row.
+    def _face(self, dev, col, row, color):
+        dx = col - self.col
+        dy = row - self.row
+        for x0, y0, x1, y1 in self._ticks:
+            dev.line(x0 + dx, y0 + dy, x1 + dx, y1 + dy, color)
+        circle(dev, self.xorigin + dx, self.yorigin + dy, self.radius, color)
 
     def show(self):
         super().show()
         # cache bound variables
         dev = self.device
-        ticks = self.ticks
         radius = self.radius
         xo = self.xorigin
         yo = self.yorigin
-        # vectors (complex)
         vor = xo + 1j * yo
-        vtstart = 0.9 * radius + 0j  # start of tick
-        vtick = 0.1 * radius + 0j  # tick
-        vrot = cmath.exp(2j * cmath.pi/ticks)  # unit rotation
-        for _ in range(ticks):
-            polar(dev, vor + conj(vtstart), vtick, self.fgcolor)
-            vtick *= vrot
-            vtstart *= vrot
-        circle(dev, xo, yo, radius, self.fgcolor)
+        palette = getattr(dev, "palette", None)
+        if palette is None:
+            self._face(dev, self.col, self.row, self.fgcolor)
+        else:  # The face is drawn with a single blit
+            if self._sprite is None:
+                d = 2 * radius + 1  # Circle may exceed height by a pixel
+                self._sprite = Glyph(bytearray(((d + 7) >> 3) * d), d, d, MONO_HLSB)
+                self._face(self._sprite, 0, 0, 1)
+            palette.bg(self.bgcolor)
+            palette.fg(self.fgcolor)
+            dev.blit(self._sprite, self.col, self.row, self.bgcolor, palette)  # Background is transparent
         vshort = 1000  # Length of shortest vector
         for v in self.vectors:
             color = self.fgcolor if v.color is None else v.color
-            val = v.value() * radius  # val is complex
+            val = v.val * radius  # val is complex
             vshort = min(vshort, cmath.polar(val)[0])
             if self.style == Dial.CLOCK:
                 polar(dev, vor, val, color)
@@ -4,16 +4,18 @@
 # Copyright (c) 2018-2022 Peter Hinch
 
 from micropython import const
-from gui.core.nanogui import DObject
-from gui.core.writer import Writer
+from gui.core.nanogui import DObject, damage
+from gui.core.writer import Writer, CWriter, Glyph
 
 ALIGN_LEFT = const(0)
 ALIGN_RIGHT = const(1)
 ALIGN_CENTER = const(2)
 
 # text: str display string int save width
+# static: text is rendered once to a FrameBuffer and subsequently drawn with a
+# single blit. For text which rarely changes, e.g. legends.
 class Label(DObject):
-    def __init__(self, writer, row, col, text, invert=False, fgcolor=None, bgcolor=None, bdcolor=False, align=ALIGN_LEFT):
+    def __init__(self, writer, row, col, text, invert=False, fgcolor=None, bgcolor=None, bdcolor=False, align=ALIGN_LEFT, static=False):
         # Determine width of object
         if isinstance(text, int):
             width = text
@@ -23,6 +25,8 @@ class Label(DObject):
         height = writer.height
         super().__init__(writer, row, col, height, width, fgcolor, bgcolor, bdcolor)
         self.align = align
+        self.static = static
+        self._sprite = None  # (key, FrameBuffer, width) of rendered text
         if text is not None:
             self.value(text, invert)
 
@@ -37,7 +41,10 @@ class Label(DObject):
         self.bdcolor = self.def_bdcolor if bdcolor is None else bdcolor
         if align is not None:
             self.align = align
-        self.show()
+        # A bool bdcolor (no border) must not match color 0 or 1.
+        bd = self.bdcolor
+        if self._changed(txt, self.invert, self.fgcolor, self.bgcolor, isinstance(bd, bool), bd, self.align):
+            self._redraw()
         return txt
 
     def show(self):
@@ -52,7 +59,49 @@ class Label(DObject):
             txt_width = wri.stringlen(txt)
             if self.width > txt_width:
                 rcol = self.width - txt_width if self.align == ALIGN_RIGHT else self.width // 2 - txt_width // 2
+        if self.static and self._blit(txt, self.col + rcol):
+            return
         Writer.set_textpos(dev, self.row, self.col + rcol)
         wri.setcolor(self.fgcolor, self.bgcolor)
         wri.printstring(txt, self.invert)
         wri.setcolor()  # Restore defaults
+
+    # Draw static text. On color displays colors are applied by the palette so
+    # the FrameBuffer is only re-rendered if the text changes. Returns False if
+    # the text must be rendered by the Writer: if it would be clipped or
+    # contains newlines or tabs.
+    def _blit(self, txt, col):
+        wri = self.writer
+        dev = self.device
+        color = isinstance(wri, CWriter)
+        ht = wri.height
+        key = txt if color else (txt, self.invert)
+        sp = self._sprite
+        if sp is None or sp[0] != key:
+            width = wri.stringlen(txt)
+            if not width or "\n" in txt or "\t" in txt:
+                return False
+            fb = Glyph(bytearray(((width + 7) >> 3) * ht), width, ht, wri.map)
+            inv = self.invert and not color  # Writer inverts the glyph
+            x = 0
+            for char in txt:
+                glyph, _, w = wri._fbuf(char, inv)
+                fb.blit(glyph, x, 0)
+                x += w
+            sp = (key, fb, width)
+            self._sprite = sp
+        if col + sp[2] > wri.screenwidth or self.row + ht > wri.screenheight:
+            return False
+        Writer.set_textpos(dev, self.row, col)
+        damage(dev, col, self.row, sp[2], ht)  # As recorded by printstring
+        if color:
+            palette = dev.palette
+            palette.bg(self.fgcolor if self.invert else self.bgcolor)
+            palette.fg(self.bgcolor if self.invert else self.fgcolor)
+            dev.blit(sp[1], col, self.row, -1, palette)
+        else:
+            dev.blit(sp[1], col, self.row)
+        # Leave the Writer as printstring would: tab expansion depends on cpos.
+        wri._getstate().text_col += sp[2]
+        wri.cpos += len(txt)
+        return True
@@ -16,7 +16,8 @@ class LED(DObject):
 
     def color(self, c=None):
         self.fgcolor = self.bgcolor if c is None else c
-        self.show()
+        if self._changed(self.fgcolor):
+            self._redraw()
 
     def show(self):
         super().show()
@@ -3,7 +3,7 @@
 # Released under the MIT License (MIT). See LICENSE.
 # Copyright (c) 2018-2020 Peter Hinch
 
-from gui.core.nanogui import DObject
+from gui.core.nanogui import DObject, damage
 from gui.widgets.label import Label
 
 
@@ -16,7 +16,7 @@ class Meter(DObject):
         super().__init__(writer, row, col, height, width, fgcolor, bgcolor, bdcolor)
         self.divisions = divisions
         if label is not None:
-            Label(writer, row + height + 3, col, label)
+            Label(writer, row + height + 3, col, label, static=True)
         self.style = style
         if legends is not None: # Legends
             x = col + width + 4
@@ -24,9 +24,11 @@ class Meter(DObject):
             dy = 0 if len(legends) <= 1 else height / (len(legends) -1)
             yl = y - writer.height / 2 # Start at bottom
             for legend in legends:
-                Label(writer, int(yl), x, legend)
+                Label(writer, int(yl), x, legend, static=True)
                 yl -= dy
         self.ptcolor = ptcolor if ptcolor is not None else self.fgcolor
+        self._drawn = None  # (pointer y, ptcolor, DObject.clears) when drawn
+        self._update = False  # Set by .value: .show may redraw incrementally
         self.value(value)
 
     def value(self, n=None, color=None):
@@ -35,29 +37,71 @@ class Meter(DObject):
         n = super().value(min(1, max(0, n)))
         if color is not None:
             self.ptcolor = color
-        self.show()
+        y = int(self.row + self.height - n * self.height)  # As drawn by .show
+        if self._changed(y, self.ptcolor):
+            self._update = True
+            self._redraw()
         return n
         
+    # Tick mark y positions
+    def _ticks(self):
+        if self.divisions > 0:
+            dy = self.height / (self.divisions)
+            return [int(self.row + dy * tick) for tick in range(self.divisions + 1)]
+        return []
+
     def show(self):
-        super().show()  # Draw or erase border
         val = super().value()
+        height = self.height
+        y = int(self.row + height - val * height) # y position of slider
+        drawn = self._drawn
+        self._drawn = (y, self.ptcolor, DObject.clears)
+        update = self._update
+        self._update = False  # A call from elsewhere redraws everything
+        if update and drawn is not None and drawn[1:] == self._drawn[1:]:
+            self._move(drawn[0], y)  # Only the pointer has moved
+            return
+        super().show()  # Draw or erase border
         wri = self.writer
         dev = self.device
         width = self.width
-        height = self.height
         x0 = self.col
         x1 = self.col + width
-        y0 = self.row
         y1 = self.row + height
-        if self.divisions > 0:
-            dy = height / (self.divisions) # Tick marks
-            for tick in range(self.divisions + 1):
-                ypos = int(y0 + dy * tick)
-                dev.hline(x0 + 2, ypos, x1 - x0 - 4, self.fgcolor)
+        dev.hline(x0, y1, width, self.bgcolor)  # Erase a LINE pointer at 0 (below the fill)
+        for ypos in self._ticks():
+            dev.hline(x0 + 2, ypos, x1 - x0 - 4, self.fgcolor)
 
-        y = int(y1 - val * height) # y position of slider
         if self.style == self.LINE:
             dev.hline(x0, y, width, self.ptcolor) # Draw pointer
         else:
             w = width / 2
             dev.fill_rect(int(x0 + w - 2), y, 4, y1 - y, self.ptcolor)
+
+    # Redraw only the rows between the old and new pointer positions.
+    def _move(self, yold, y):
+        dev = self.device
+        x0 = self.col
+        x1 = self.col + self.width
+        ticks = self._ticks()
+        if self.style == self.LINE:
+            damage(dev, x0, yold, self.width, 1)
+            dev.hline(x0, yold, self.width, self.bgcolor)  # Erase pointer
+            if yold in ticks:
+                dev.hline(x0 + 2, yold, x1 - x0 - 4, self.fgcolor)
+            damage(dev, x0, y, self.width, 1)
+            dev.hline(x0, y, self.width, self.ptcolor)
+            return
+        xb = int(x0 + self.width / 2 - 2)  # Bar occupies xb..xb+3
+        damage(dev, xb, min(y, yold), 4, abs(y - yold))
+        if y < yold:  # Bar has grown
+            dev.fill_rect(xb, y, 4, yold - y, self.ptcolor)
+            return
+        dev.fill_rect(xb, yold, 4, y - yold, self.bgcolor)
+        # Restore the part of any tick mark hidden by the bar
+        xa = max(xb, x0 + 2)
+        w = min(xb + 4, x1 - 2) - xa
+        if w > 0:
+            for ypos in ticks:
+                if yold <= ypos < y:
+                    dev.hline(xa, ypos, w, self.fgcolor)
@@ -6,7 +6,8 @@
 # Usage:
 # from gui.widgets.scale import Scale
 
-from gui.core.nanogui import DObject
+from gui.core.nanogui import DObject, damage
+from framebuf import FrameBuffer, RGB565, GS8, GS4_HMSB
 from gui.core.writer import Writer
 from gui.core.colors import BLACK
 
@@ -48,9 +49,24 @@ class Scale(DObject):
         self.mdy0 = ycl - self.mdl // 2
         self.ldl = ctrl_ht  # Large tick
         self.ldy0 = ycl - self.ldl // 2
+        self.ybd = self.y0 + text_ht  # Top of band containing ticks
+        self._legends = {}  # (text, width) of each legend indexed by tick no.
+        self._view = None  # FrameBuffer mapped onto legend area of display
+        self._drawn = None  # (value, DObject.clears) when drawn
+        self._update = False  # Set by .value: .show may redraw incrementally
 
+    # An update by .value redraws ticks and pointer. Legends are scrolled where
+    # the display's buffer can be mapped (color displays) with only those which
+    # have entered or left the window being rendered. Other calls redraw fully.
     def show(self):
-        wri = self.writer
+        val: int = self._value  # 0..ticks*10
+        drawn = self._drawn
+        self._drawn = (val, DObject.clears)
+        update = self._update
+        self._update = False
+        if update and drawn is not None and drawn[1] == DObject.clears:
+            self._move(drawn[0], val)
+            return
         dev = self.device
         x0: int = self.x0  # Internal rectangle occupied by scale and text
         x1: int = self.x1
@@ -58,10 +74,17 @@ class Scale(DObject):
         y1: int = self.y1
         dev.fill_rect(x0, y0, x1 - x0, y1 - y0, self.bgcolor)
         super().show()
+        for iv, x in self._xticks(val):
+            if not iv % 10:
+                txt, tlen = self._legend(iv)
+                self._text(txt, min(x, x1 - tlen))
+            self._tick(iv, x)
+        dev.vline(x0 + (x1 - x0) // 2, y0, y1 - y0, self.ptrcolor) # Draw pointer
+
+    # Yield (iv, x) for each visible tick. iv increments for each tick. Its
+    # value modulo N determines tick length. x is its X position.
+    def _xticks(self, val):
         # Scale is drawn using ints. Each division is 10 units.
-        val: int = self._value  # 0..ticks*10
-        # iv increments for each tick. Its value modulo N determines tick length
-        iv: int  # val / 10 at a tick position
         d: int  # val % 10: offset relative to a tick position
         fx: int  # X offset of current tick in value units 
         if val >= 100:  # Whole LHS of scale will be drawn
@@ -74,38 +97,132 @@ class Scale(DObject):
 
         # Window shows 20 divisions, each of which corresponds to 10 units of value.
         # So pixels per unit value == win_width/200
+        x0: int = self.x0
+        x1: int = self.x1
         win_width: int = x1 - x0
         ticks: int = self.ticks  # Total # of ticks visible and hidden
         while True:
             x: int = x0 + (fx * win_width) // 200  # Current X position
-            ys: int  # Start Y position for tick
-            yl: int  # tick length
             if x > x1 or iv > ticks:  # Out of space or data (scroll left)
                 break
-            if not iv % 10:
-                txt = self.legendcb(self._fvalue(iv * 10))
-                tlen = wri.stringlen(txt)
-                Writer.set_textpos(dev, y0, min(x, x1 - tlen))
-                wri.setcolor(self.fontcolor, self.bgcolor)
-                wri.printstring(txt)
-                wri.setcolor()
-                ys = self.ldy0  # Large tick
-                yl = self.ldl
-            elif not iv % 5:
-                ys = self.mdy0
-                yl = self.mdl
-            else:
-                ys = self.sdy0
-                yl = self.sdl
-            if self.tickcb is None:
-                color = self.fgcolor
-            else:
-                color = self.tickcb(self._fvalue(iv * 10), self.fgcolor)
-            dev.vline(x, ys, yl, color)  # Draw tick
+            yield iv, x
             fx += 10
             iv += 1
 
-        dev.vline(x0 + (x1 - x0) // 2, y0, y1 - y0, self.ptrcolor) # Draw pointer
+    def _tick(self, iv, x):
+        if not iv % 10:
+            ys = self.ldy0  # Large tick
+            yl = self.ldl
+        elif not iv % 5:
+            ys = self.mdy0
+            yl = self.mdl
+        else:
+            ys = self.sdy0
+            yl = self.sdl
+        if self.tickcb is None:
+            color = self.fgcolor
+        else:
+            color = self.tickcb(self._fvalue(iv * 10), self.fgcolor)
+        self.device.vline(x, ys, yl, color)  # Draw tick
+
+    # Legend text and its width are computed once per tick.
+    def _legend(self, iv):
+        try:
+            return self._legends[iv]
+        except KeyError:
+            txt = self.legendcb(self._fvalue(iv * 10))
+            r = (txt, self.writer.stringlen(txt))
+            self._legends[iv] = r
+            return r
+
+    def _text(self, txt, x):
+        wri = self.writer
+        Writer.set_textpos(self.device, self.y0, x)
+        wri.setcolor(self.fontcolor, self.bgcolor)
+        wri.printstring(txt)
+        wri.setcolor()
+
+    # List of (iv, x, width) of legends visible at a value.
+    def _lpos(self, val):
+        x1 = self.x1
+        r = []
+        for iv, x in self._xticks(val):
+            if not iv % 10:
+                tlen = self._legend(iv)[1]
+                r.append((iv, min(x, x1 - tlen), tlen))
+        return r
+
+    # Map a FrameBuffer onto the legend area of the display. Returns False if
+    # the display's format is unsupported.
+    def _mkview(self):
+        dev = self.device
+        w = dev.width
+        x0 = self.x0
+        x1 = self.x1
+        try:
+            buf = memoryview(dev)
+        except TypeError:
+            return False
+        n = len(buf)
+        if n == w * dev.height * 2:
+            mode, bpp = RGB565, 16
+        elif n == w * dev.height:
+            mode, bpp = GS8, 8
+        elif n == ((w + 1) >> 1) * dev.height and not (w & 1):
+            mode, bpp = GS4_HMSB, 4
+            x0 = (x0 + 1) & ~1  # Byte aligned
+            x1 &= ~1
+        else:
+            return False
+        offs = ((self.y0 * w + x0) * bpp) >> 3
+        view = FrameBuffer(buf[offs:], x1 - x0, self.ybd - self.y0, mode, w)
+        return (view, x0, x1)
+
+    # Update from one value to another.
+    def _move(self, old, val):
+        dev = self.device
+        x0: int = self.x0
+        x1: int = self.x1
+        y0: int = self.y0
+        y1: int = self.y1
+        yb: int = self.ybd
+        pc: int = x0 + (x1 - x0) // 2  # Pointer
+        damage(dev, x0, y0, x1 - x0 + 1, y1 - y0)
+        lold = self._lpos(old)
+        lnew = self._lpos(val)
+        if lold != lnew:
+            # Legends move together: window width is even.
+            w = x1 - x0
+            dx = ((100 - val) * w) // 200 - ((100 - old) * w) // 200
+            keep = []  # Legends which can be retained
+            if dx:
+                if self._view is None:
+                    self._view = self._mkview()
+                if self._view:
+                    view, vx0, vx1 = self._view
+                    view.scroll(dx, 0)
+                    for iv, x, tlen in lold:
+                        # Must lie in the view and not contain the old pointer.
+                        if (iv, x + dx, tlen) in lnew and vx0 <= min(x, x + dx) \
+                           and max(x, x + dx) + tlen <= vx1 and not x <= pc < x + tlen:
+                            keep.append((x + dx, tlen))
+            else:
+                keep = [(x, tlen) for iv, x, tlen in lold if (iv, x, tlen) in lnew]
+            # Erase everything else then render missing legends.
+            x = x0
+            for xk, tlen in keep:
+                if xk > x:
+                    dev.fill_rect(x, y0, xk - x, yb - y0, self.bgcolor)
+                x = max(x, xk + tlen)
+            if x1 > x:
+                dev.fill_rect(x, y0, x1 - x, yb - y0, self.bgcolor)
+            for iv, x, tlen in lnew:
+                if (x, tlen) not in keep:
+                    self._text(self._legend(iv)[0], x)
+        dev.fill_rect(x0, yb, x1 - x0 + 1, y1 - yb, self.bgcolor)
+        for iv, x in self._xticks(val):
+            self._tick(iv, x)
+        dev.vline(pc, y0, y1 - y0, self.ptrcolor) # Draw pointer
 
     def _to_int(self, v):
         return round((v + 1.0) * self.ticks * 5)  # 0..self.ticks*10
@@ -119,5 +236,6 @@ class Scale(DObject):
             v = self._to_int(val)
             if v != self._value:
                 self._value = v
-                self.show()
+                self._update = True
+                self._redraw()
         return self._fvalue(self._value)
@@ -27,45 +27,24 @@ class Textbox(DObject):
 
     def _add_lines(self, s):
         width = self.width
-        font = self.writer.font
-        n = -1  # Index into string
-        newline = True
-        while True:
-            n += 1
-            if newline:
-                newline = False
-                ls = n  # Start of line being processed
-                col = 0  # Column relative to text area
-            if n >= len(s):  # End of string
-                if n > ls:
-                    self.lines.append(s[ls :])
-                return
-            c = s[n]  # Current char
-            if c == '\n':
-                self.lines.append(s[ls : n])
-                newline = True
-                continue  # Line fits window
-            col += font.get_ch(c)[2]  # width of current char
-            if col > width:
-                if self.clip:
-                    p = s[ls :].find('\n')  # end of 1st line
-                    if p == -1:
-                        self.lines.append(s[ls : n])  # clip, discard all to right
-                        return
-                    self.lines.append(s[ls : n])  # clip, discard to 1st newline
-                    n = p  # n will move to 1st char after newline
-                elif c == ' ':  # Easy word wrap
-                    self.lines.append(s[ls : n])
-                else:  # Edge splits a word
-                    p = s.rfind(' ', ls, n + 1)
-                    if p >= 0:  # spacechar in line: wrap at space
-                        assert (p > 0), 'space char in position 0'
-                        self.lines.append(s[ls : p])
-                        n = p
-                    else:  # No spacechar: wrap at end
-                        self.lines.append(s[ls : n])
-                        n -= 1  # Don't skip current char
-                newline = True
+        wri = self.writer
+        q = s.split('\n')
+        last = len(q) - 1
+        for n, line in enumerate(q):
+            if not line:
+                if n != last:  # Trailing newline does not add a line
+                    self.lines.append(line)
+            elif self.clip:  # Discard all to right of window
+                col = 0
+                for p, c in enumerate(line):
+                    col += wri._advance(c)  # width of current char
+                    if col > width:
+                        line = line[:p]
+                        break
+                self.lines.append(line)
+            else:  # Word wrap, splitting words which are too long
+                for start, end in wri.linebreaks(line, width, 0, True):
+                    self.lines.append(line[start:end])
 
     def _print_lines(self):
         if len(self.lines) == 0:
@@ -10,11 +10,16 @@
 # this ia a PC utility. Major speed and RAM usage improvements are possible if
 # dithering is restricted to one algorithm and is to run on a microcontroller. See
 # above refernced docs.
+# Images are converted a row at a time. NumPy is used if installed.
 
 import argparse
 import sys
 import os
+import glob
+import json
+import hashlib
 from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
 
 # FrameBuffer constants with string mappings
 RGB565 = 1
@@ -46,94 +51,205 @@ dither_options = {"FS": FS, "Burke": BURKE, "Atkinson": ATKINSON, "Sierra": SIER
 # Empirical results creating RRRGGGBB images: Dithering substantially improves some images.
 # Differences between the algorithms are subtle.
 
-# Apply dithering to an integer pixel array. Initially this contains raw integer
-# vaues of a color, assumed to be left shifted by at least 4 bits. On each call
-# the error e is added to forward pixels scaled according to the dithering tuple.
-def dither(arr, ra, row, col, rows, cols, e):
-    if arr is not None:
-        div = arr[0]
-        for dr, dc, mul in arr[1:]:
-            r = row + dr
+# Conversion is streamed: rows are read, dithered and written one at a time. Only
+# the rows which the dithering kernel can reach (at most 3) are held in memory.
+# If NumPy is installed error diffusion to following rows and packing of output
+# rows are vectorised. Results are identical with and without NumPy.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Split a dithering tuple into (divisor, terms affecting the current row,
+# terms affecting following rows, no. of following rows). Following row terms
+# are sorted so that each pixel receives error contributions in the order of the
+# source pixels, as happens when pixels are processed one at a time.
+def kernel(arr):
+    if arr is None:
+        return 1, (), (), 0
+    inrow = tuple((dc, mul) for dr, dc, mul in arr[1:] if not dr)
+    fwd = sorted((t for t in arr[1:] if t[0]), key=lambda t: (t[0], -t[1]))
+    return arr[0], inrow, tuple(fwd), max((t[0] for t in fwd), default=0)
+
+
+# Quantise one channel of a row of 16-bit values, diffusing each error to
+# subsequent pixels of the row. Values are left unchanged: a quantised value is
+# value & mask. Returns a list of errors.
+def quantise(vals, mask, div, inrow):
+    cols = len(vals)
+    errs = [0] * cols
+    for col in range(cols):
+        e = vals[col] - (vals[col] & mask)
+        errs[col] = e
+        if e:
+            for dc, mul in inrow:
+                c = col + dc
+                if c < cols:
+                    factor = round(e * mul / div)
+                    if vals[c] + factor < 0xFFFF:  # Only apply if it won't cause
+                        vals[c] += factor  # overflow.
+    return errs
+
+
+# Add errors from a row to a following row.
+def diffuse(vals, errs, dc, mul, div):
+    cols = len(vals)
+    for col in range(max(0, -dc), min(cols, cols - dc)):
+        e = errs[col]
+        if e:
+            factor = round(e * mul / div)
             c = col + dc
-            if r < rows and 0 <= c < cols:
-                factor = round(e * mul / div)
-                if ra[r][c] + factor < 0xFFFF:  # Only apply if it won't cause
-                    ra[r][c] += factor  # overflow.
+            if vals[c] + factor < 0xFFFF:
+                vals[c] += factor
 
 
-# Convert a stream of 8-bit greyscale values to 4-bit values with Burke dithering
-def convgs(arr, rows, cols, si, so):
-    ra = []  # Greyscale values
-    nibbles = [0, 0]
-    for row in range(rows):
-        ra.append([0] * cols)
-    for row in range(rows):
-        for col in range(cols):
-            ra[row][col] = int.from_bytes(si.read(1), "big") << 8  # 16 bit greyscale
+def diffuse_np(vals, errs, dc, mul, div):
+    cols = len(vals)
+    factor = np.round(errs * mul / div).astype(np.int64)
+    if dc >= 0:
+        dest, factor = vals[dc:], factor[: cols - dc]
+    else:
+        dest, factor = vals[: cols + dc], factor[-dc:]
+    res = dest + factor
+    np.copyto(dest, res, where=res < 0xFFFF)
+
+
+# Generator: dither a stream of rows. getrow() returns the next row as a list of
+# channels, each a sequence of 16-bit values. masks holds a quantisation mask for
+# each channel. Yields each row as a list of channels of final (unquantised)
+# values: these are lists, or arrays if NumPy is used.
+def dither_rows(arr, rows, masks, getrow):
+    div, inrow, fwd, depth = kernel(arr)
+    use_np = np is not None
+    window = []  # Current row followed by the rows it affects
     for row in range(rows):
-        col = 0
-        while col < cols:
-            for n in range(2):
-                c = ra[row][col]
-                nibbles[n] = c >> 12
-                e = c & 0x0FFF  # error
-                dither(arr, ra, row, col, rows, cols, e)  # Adjust forward pixels
-                col += 1
-            # print(row, col, nibbles)
-            so.write(int.to_bytes((nibbles[0] << 4) | nibbles[1], 1, "big"))
-
-
-# Convert a stream of RGB888 data to rrrgggbb
+        while len(window) <= depth and row + len(window) < rows:
+            chans = getrow()
+            window.append([np.array(ch, np.int64) if use_np else list(ch) for ch in chans])
+        cur = window.pop(0)
+        for n, mask in enumerate(masks):
+            vals = cur[n].tolist() if use_np else cur[n]
+            errs = quantise(vals, mask, div, inrow)
+            if use_np:
+                cur[n] = np.array(vals, np.int64)
+                errs = np.array(errs, np.int64)
+            for dr, dc, mul in fwd:
+                if dr <= len(window):
+                    (diffuse_np if use_np else diffuse)(window[dr - 1][n], errs, dc, mul, div)
+        yield cur
+
+
+# Convert a stream of 8-bit greyscale values to 4-bit values with dithering.
+def convgs(arr, rows, cols, si, so):
+    def getrow():
+        row = si.read(cols)
+        if use_np:
+            return (np.frombuffer(row, np.uint8).astype(np.int64) << 8,)  # 16 bit greyscale
+        return ([b << 8 for b in row],)
+
+    use_np = np is not None
+    for (grey,) in dither_rows(arr, rows, (0xF000,), getrow):
+        if use_np:
+            nib = grey >> 12
+            if cols & 1:
+                nib = np.append(nib, 0)
+            so.write(((nib[0::2] << 4) | nib[1::2]).astype(np.uint8).tobytes())
+        else:
+            nib = [v >> 12 for v in grey] + [0] * (cols & 1)
+            so.write(bytes((h << 4) | l for h, l in zip(nib[0::2], nib[1::2])))
+
+
+# Convert a stream of RGB888 data to rrrgggbb or RGB565
 def convrgb(arr, rows, cols, si, so, bits):
-    red = []
-    grn = []
-    blu = []
-    for row in range(rows):
-        red.append([0] * cols)
-        grn.append([0] * cols)
-        blu.append([0] * cols)
-    for row in range(rows):
-        for col in range(cols):
-            red[row][col] = int.from_bytes(si.read(1), "big") << 8  # 16 bit values
-            grn[row][col] = int.from_bytes(si.read(1), "big") << 8
-            blu[row][col] = int.from_bytes(si.read(1), "big") << 8
-    if bits == 8:
-        for row in range(rows):
-            for col in range(cols):
-                r = red[row][col] & 0xE000
-                err = red[row][col] - r
-                dither(arr, red, row, col, rows, cols, err)
-                g = grn[row][col] & 0xE000
-                err = grn[row][col] - g
-                dither(arr, grn, row, col, rows, cols, err)
-                b = blu[row][col] & 0xC000
-                err = blu[row][col] - b
-                dither(arr, blu, row, col, rows, cols, err)
-                op = (red[row][col] >> 8) & 0xE0
-                op |= (grn[row][col] >> 11) & 0x1C
-                op |= (blu[row][col] >> 14) & 0x03
-                so.write(int.to_bytes(op, 1, "big"))
-    else:  # RGB565
-        for row in range(rows):
-            for col in range(cols):
-                r = red[row][col] & 0xF800
-                err = red[row][col] - r
-                dither(arr, red, row, col, rows, cols, err)
-                g = grn[row][col] & 0xFC00
-                err = grn[row][col] - g
-                dither(arr, grn, row, col, rows, cols, err)
-                b = blu[row][col] & 0xF800
-                err = blu[row][col] - b
-                dither(arr, blu, row, col, rows, cols, err)
-                op = (red[row][col]) & 0xF800
-                op |= (grn[row][col] >> 5) & 0x07E0
-                op |= (blu[row][col] >> 11) & 0x001F
-                # Color mappings checked on display
-                so.write(int.to_bytes(op, 2, "big"))  # Red first
+    def getrow():
+        row = si.read(cols * 3)
+        if use_np:
+            return np.frombuffer(row, np.uint8).reshape(cols, 3).T.astype(np.int64) << 8
+        return [[b << 8 for b in row[n::3]] for n in range(3)]  # 16 bit values
+
+    use_np = np is not None
+    masks = (0xE000, 0xE000, 0xC000) if bits == 8 else (0xF800, 0xFC00, 0xF800)
+    for red, grn, blu in dither_rows(arr, rows, masks, getrow):
+        if bits == 8:
+            if use_np:
+                op = ((red >> 8) & 0xE0) | ((grn >> 11) & 0x1C) | ((blu >> 14) & 0x03)
+                so.write(op.astype(np.uint8).tobytes())
+            else:
+                so.write(bytes(((r >> 8) & 0xE0) | ((g >> 11) & 0x1C) | ((b >> 14) & 0x03)
+                               for r, g, b in zip(red, grn, blu)))
+        else:  # RGB565. Color mappings checked on display
+            if use_np:
+                op = (red & 0xF800) | ((grn >> 5) & 0x07E0) | ((blu >> 11) & 0x001F)
+                so.write(op.astype(">u2").tobytes())  # Red first
+            else:
+                op = bytearray()
+                for r, g, b in zip(red, grn, blu):
+                    op += ((r & 0xF800) | ((g >> 5) & 0x07E0) | ((b >> 11) & 0x001F)).to_bytes(2, "big")
+                so.write(op)
+
+
+# **** Compressed output ****
+# PackBits compression applied to each row. The file has an 8-byte header:
+# b"PB", mode, 0, rows, cols (16 bit big-endian values). Each row comprises a
+# 16-bit big-endian count of the bytes which follow, then a sequence of runs.
+# A run header n < 128 is followed by n + 1 literal pixels, n > 128 by one pixel
+# which is repeated 257 - n times. A pixel is 2 bytes for RGB565, otherwise one
+# byte (for GS4_HMSB a byte holds two pixels).
+PACKED = b"PB"
+
+
+def rowbytes(cols, mode):
+    return cols * 2 if mode == RGB565 else cols if mode == GS8 else (cols + 1) // 2
+
+
+def packbits(data, size):
+    units = [bytes(data[n : n + size]) for n in range(0, len(data), size)]
+    minrun = 2 if size > 1 else 3  # Shortest run which saves space
+    out = bytearray()
+    lit = []  # Pending literal pixels
+
+    def flush():
+        while lit:
+            k = min(len(lit), 128)
+            out.append(k - 1)
+            out.extend(b"".join(lit[:k]))
+            del lit[:k]
+
+    n = 0
+    while n < len(units):
+        r = n + 1
+        while r < len(units) and r - n < 128 and units[r] == units[n]:
+            r += 1
+        if r - n >= minrun:
+            flush()
+            out.append(257 - (r - n))
+            out.extend(units[n])
+            n = r
+        else:
+            lit.append(units[n])
+            n += 1
+    flush()
+    return out
+
+
+# Output stream which compresses rows written to it.
+class RowPacker:
+    def __init__(self, stream, cols, mode):
+        self.stream = stream
+        self.nbytes = rowbytes(cols, mode)
+        self.size = 2 if mode == RGB565 else 1
+        self.buf = bytearray()
+
+    def write(self, data):
+        self.buf += data
+        while len(self.buf) >= self.nbytes:
+            row = packbits(self.buf[: self.nbytes], self.size)
+            self.stream.write(len(row).to_bytes(2, "big") + row)
+            del self.buf[: self.nbytes]
 
 
 # Convert an input stream, putting result on an output stream.
-def conv(arr, si, so, height, width, mode):
+def conv(arr, si, so, height, width, mode, packed=False):
     fmt = si.readline()  # Get file format
     txt = si.readline()
     while txt.startswith(b"#"):  # Ignore comments
@@ -144,7 +260,11 @@ def conv(arr, si, so, height, width, mode):
     cdepth = int(si.readline())
     if fmt[:2] != fmtstr[mode]:
         quit("Source file contents do not match file extension.")
-    so.write(b"".join((rows.to_bytes(2, "big"), cols.to_bytes(2, "big"))))
+    if packed:
+        so.write(b"".join((PACKED, bytes((mode, 0)), rows.to_bytes(2, "big"), cols.to_bytes(2, "big"))))
+        so = RowPacker(so, cols, mode)
+    else:
+        so.write(b"".join((rows.to_bytes(2, "big"), cols.to_bytes(2, "big"))))
     if height is not None and width is not None:
         if not (cols == width and rows == height):
             print(f"Warning: Specified dimensions {width}x{height}")
@@ -206,19 +326,139 @@ def write_var(stream, name, arg):
 
 
 # Write Python source using data stream on sd
-def writepy(ip_stream, op_stream, rows, cols, mode, fname):
+def writepy(ip_stream, op_stream, rows, cols, mode, fname, packed=False):
     op_stream.write("# Code generated by img_cvt.py.")
     write_var(op_stream, "version", "0.1")
     write_var(op_stream, "source", fname)
     write_var(op_stream, "rows", rows)
     write_var(op_stream, "cols", cols)
     write_var(op_stream, "mode", mode)
+    if packed:
+        write_var(op_stream, "packed", True)
     bw_data = ByteWriter(op_stream, "data")
-    ip_stream.seek(4)  # Skip 4 bytes of dimension data
+    ip_stream.seek(8 if packed else 4)  # Skip header
     bw_data.odata(ip_stream.read())
     bw_data.eot()
 
 
+# **** Batch conversion ****
+
+MANIFEST = ".img_cvt.json"  # Hashes of converted files in the output directory
+
+
+# Return a sorted list of the source images in a directory or matching a glob.
+def batch_files(spec):
+    if os.path.isdir(spec):
+        spec = os.path.join(spec, "*")
+    files = glob.glob(spec, recursive=True)
+    return sorted(f for f in files if os.path.splitext(f)[1].upper() in (".PPM", ".PGM"))
+
+
+# Hash of the source file and the options which affect the output.
+def digest(fname, opts):
+    h = hashlib.sha256(opts.encode())
+    with open(fname, "rb") as f:
+        while data := f.read(65536):
+            h.update(data)
+    return h.hexdigest()
+
+
+# Convert a file, writing Python source if outfile has a .py extension.
+# Returns (rows, cols).
+def convert(arr, infile, outfile, mode, packed):
+    with open(infile, "rb") as si:
+        if os.path.splitext(outfile)[1].upper() == ".PY":
+            with BytesIO() as so, open(outfile, "w") as sp:
+                rows, cols = conv(arr, si, so, None, None, mode, packed)
+                writepy(so, sp, rows, cols, mode, infile, packed)
+        else:
+            with open(outfile, "wb") as sp:
+                rows, cols = conv(arr, si, sp, None, None, mode, packed)
+    return rows, cols
+
+
+# Runs in a worker process. Returns None on failure.
+def batch_job(job):
+    try:
+        return convert(*job)
+    except SystemExit:  # conv has printed the reason
+        print(f"{job[1]} not converted.")
+    except (OSError, ValueError) as e:
+        print(f"{job[1]} not converted: {e}")
+    if os.path.isfile(job[2]):
+        os.remove(job[2])
+    return None
+
+
+# Write a Python module listing the images in the output directory.
+def write_index(fname, assets):
+    names = {RGB565: "RGB565", GS4_HMSB: "GS4_HMSB", GS8: "GS8"}
+    with open(fname, "w") as f:
+        f.write("# Code generated by img_cvt.py.\n")
+        f.write("# Images in this directory. name: (file, rows, cols, mode)\n")
+        for mode, name in names.items():
+            write_var(f, name, mode)
+        f.write("images = {\n")
+        for name, a in sorted(assets.items()):
+            f.write(f'    "{name}": ("{a["file"]}", {a["rows"]}, {a["cols"]}, {names[a["mode"]]}),\n')
+        f.write("}\n")
+
+
+# Convert every image in a directory or glob, using a process pool. Files whose
+# source and options are unchanged since the last run are skipped.
+def batch(args, arr):
+    files = batch_files(args.infile)
+    if not files:
+        quit(f"No ppm or pgm files match {args.infile}.")
+    outdir = args.outfile
+    os.makedirs(outdir, exist_ok=True)
+    ext = ".py" if args.py else ".bin"
+    mname = os.path.join(outdir, MANIFEST)
+    try:
+        with open(mname) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    assets = {}
+    jobs = []
+    for infile in files:
+        name = os.path.splitext(os.path.basename(infile))[0]
+        if name in assets:
+            quit(f"{infile}: more than one source file would create {name}{ext}.")
+        if infile.upper().endswith(".PGM"):
+            mode = GS4_HMSB
+        else:
+            mode = RGB565 if args.rgb565 else GS8
+        outfile = os.path.join(outdir, name + ext)
+        h = digest(infile, f"{args.dither} {mode} {ext}" + (" packbits" if args.packbits else ""))
+        old = manifest.get(name)
+        if not args.force and old is not None and old["hash"] == h and os.path.isfile(outfile):
+            assets[name] = old
+        else:
+            assets[name] = {"hash": h, "file": name + ext, "mode": mode}
+            jobs.append((arr, infile, outfile, mode, args.packbits))
+    if args.jobs == 1:
+        results = map(batch_job, jobs)
+    else:
+        with ProcessPoolExecutor(args.jobs) as ex:
+            results = list(ex.map(batch_job, jobs))
+    failed = 0
+    for job, res in zip(jobs, results):
+        name = os.path.splitext(os.path.basename(job[2]))[0]
+        if res is None:
+            del assets[name]
+            failed += 1
+        else:
+            assets[name]["rows"], assets[name]["cols"] = res
+    with open(mname, "w") as f:
+        json.dump(assets, f, indent=1, sort_keys=True)
+    write_index(os.path.join(outdir, args.index), assets)
+    nconv = len(jobs) - failed
+    print(f"{nconv} files converted, {len(files) - len(jobs)} unchanged, {failed} failed.")
+    if failed:
+        sys.exit(1)
+
+
 # **** Parse command line arguments ****
 
 
@@ -240,6 +480,13 @@ By default the Atkinson dithering algorithm is used. Other options are FS
 (Floyd–Steinberg), Burke, Sierra and None.
 
 If the output filename extension is ".py" a Python sourcefile will be output.
+The --packbits option compresses the output: this suits images with areas of
+flat color.
+
+Batch mode: if infile is a directory or a glob pattern (quote it to prevent
+shell expansion) all ppm and pgm files are converted in parallel, outfile being
+the output directory. Files are only converted if they have changed since the
+last run. An index module listing each image's dimensions and mode is created.
 """
 
 if __name__ == "__main__":
@@ -258,7 +505,15 @@ if __name__ == "__main__":
         choices=["Atkinson", "Burke", "Sierra", "FS", "None"],
     )
     parser.add_argument("--rgb565", action="store_true", help="Create 16-bit RGB565 file.")
+    parser.add_argument("-p", "--packbits", action="store_true", help="Compress the image.")
+    parser.add_argument("--py", action="store_true", help="Batch mode: output Python source.")
+    parser.add_argument("-j", "--jobs", type=int, help="Batch mode: no. of processes (default: all cores).")
+    parser.add_argument("--index", default="images.py", help="Batch mode: name of index module.")
+    parser.add_argument("--force", action="store_true", help="Batch mode: convert unchanged files.")
     args = parser.parse_args()
+    if os.path.isdir(args.infile) or any(c in args.infile for c in "*?["):
+        batch(args, dither_options[args.dither])
+        sys.exit(0)
     if not os.path.isfile(args.infile):
         quit("Source image filename does not exist")
     extension = os.path.splitext(args.infile)[1].upper()
@@ -286,10 +541,10 @@ if __name__ == "__main__":
     try:
         if ofextension == ".PY":
             with BytesIO() as so:  # Write to stream. Return dimensions from file
-                rows, cols = conv(arr, si, so, args.rows, args.cols, mode)
-                writepy(so, sp, rows, cols, mode, args.infile)
+                rows, cols = conv(arr, si, so, args.rows, args.cols, mode, args.packbits)
+                writepy(so, sp, rows, cols, mode, args.infile, args.packbits)
         else:
-            rows, cols = conv(arr, si, sp, args.rows, args.cols, mode)
+            rows, cols = conv(arr, si, sp, args.rows, args.cols, mode, args.packbits)
         print(f"{ftype} file {args.outfile} written in {modestr[mode]}.")
     finally:
         si.close()